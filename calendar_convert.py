@@ -0,0 +1,330 @@
+# 파일 역할: calendar_convert.py
+# 이 파일은 만세력 DB('calenda_data')의 양력/음력 대응표를 이용해 날짜를 '한꺼번에' 변환하는 기능을 담당합니다.
+# 한 날짜씩 DataFrame을 필터링하는 대신, 양력·음력 날짜를 각각 정수(서수)로 바꾼 정렬된 색인을 만들어 두고
+# numpy의 이진 탐색(searchsorted)으로 수백만 개의 날짜를 한 번에 찾습니다.
+#
+# 사용 예 (CRM: 음력 생일을 올해 양력 날짜로 바꾸기):
+#   converter = load_converter('manse_db.sqlite')
+#   result = lunar_to_solar(converter, 2025, customers['lunar_month'], customers['lunar_day'],
+#                           customers['is_leap'], policy='nearest')
+#
+# 변환 결과에는 항상 'status' 컬럼이 있어, 변환할 수 없는 날짜를 조용히 무시하지 않고 이유를 알려줍니다.
+#   ok              정상 변환
+#   adjusted        policy='nearest'로 가장 가까운 날짜로 바꾸어 변환 (윤달 없음 → 평달, 30일 없음 → 말일)
+#   invalid_date    존재할 수 없는 날짜 (예: 양력 2월 30일, 음력 13월, 정수가 아닌 값 2000.7)
+#   no_leap_month   해당 해에 그 달의 윤달이 없음
+#   nonexistent_day 해당 음력 달이 작은 달(29일)이라 30일이 없음
+#   out_of_range    DB 지원 범위를 벗어난 날짜
+#   missing         연·월·일 중 값이 비어 있음 (None, NaN, pd.NA)
+#
+# 사용법 (성능 측정):
+#   python calendar_convert.py bench [--db manse_db.sqlite] [--count 1000000]
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+STATUS_OK = 'ok'
+STATUS_ADJUSTED = 'adjusted'
+STATUS_INVALID_DATE = 'invalid_date'
+STATUS_NO_LEAP_MONTH = 'no_leap_month'
+STATUS_NONEXISTENT_DAY = 'nonexistent_day'
+STATUS_OUT_OF_RANGE = 'out_of_range'
+STATUS_MISSING = 'missing'
+
+
+# --- 1. 날짜 ↔ 정수 변환 (numpy 벡터 연산) ---
+
+def _days_from_civil(years, months, days):
+    """양력 (연, 월, 일) 배열을 1970-01-01 기준 일수 배열로 바꿉니다. (그레고리력, 벡터 연산)"""
+    y = years - (months <= 2)
+    era = np.floor_divide(y, 400)
+    yoe = y - era * 400
+    mp = (months + 9) % 12
+    doy = (153 * mp + 2) // 5 + days - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _civil_from_days(day_numbers):
+    """1970-01-01 기준 일수 배열을 양력 (연, 월, 일) 배열로 바꿉니다. _days_from_civil의 역변환입니다."""
+    z = day_numbers + 719468
+    era = np.floor_divide(z, 146097)
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    days = doy - (153 * mp + 2) // 5 + 1
+    months = np.where(mp < 10, mp + 3, mp - 9)
+    years = yoe + era * 400 + (months <= 2)
+    return years, months, days
+
+
+def _is_valid_solar(years, months, days):
+    """양력 날짜 배열 중 실제로 존재하는 날짜인지 여부를 반환합니다. (윤년 포함)"""
+    is_leap_year = ((years % 4 == 0) & (years % 100 != 0)) | (years % 400 == 0)
+    month_lengths = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+    valid_month = (months >= 1) & (months <= 12)
+    max_days = month_lengths[np.where(valid_month, months, 0)] + (valid_month & (months == 2) & is_leap_year)
+    return valid_month & (days >= 1) & (days <= max_days)
+
+
+def _lunar_month_key(years, months, is_leap):
+    """음력 (연, 월, 윤달 여부)를 정렬 가능한 정수로 바꿉니다. 같은 달의 윤달은 평달 바로 뒤에 옵니다."""
+    return (years * 100 + months) * 2 + is_leap
+
+
+def _lunar_day_key(years, months, days, is_leap):
+    """음력 (연, 월, 일, 윤달 여부)를 정렬 가능한 정수로 바꿉니다."""
+    return _lunar_month_key(years, months, is_leap) * 100 + days
+
+
+def _as_int_array(values):
+    """
+    값을 int64 배열로 바꾸고, (정수 배열, 결측값 여부, 정수가 아닌 값 여부)를 반환합니다.
+    결측값(None, NaN, pd.NA)과 정수가 아닌 값(예: 2000.7, inf) 자리는 0으로 채워 두므로, 호출한 쪽에서 따로 상태를 표시해야 합니다.
+    """
+    missing = np.asarray(pd.isna(values))
+    if missing.any():
+        array = np.array(values, dtype=object)
+        array[missing] = 0
+    else:
+        array = np.asarray(values)
+    if array.dtype.kind in ('i', 'u', 'b'):
+        return array.astype(np.int64), missing, np.zeros(array.shape, dtype=bool)
+    float_array = array.astype(np.float64)
+    not_integer = ~np.isfinite(float_array) | (float_array != np.floor(float_array))
+    return np.where(not_integer, 0, float_array).astype(np.int64), missing, not_integer
+
+
+def _as_date_arrays(years, months, days, *extra):
+    """
+    연·월·일(과 extra 배열)을 같은 모양의 1차원 이상 배열(복사본)로 맞춥니다.
+    반환값: (years, months, days, *extra, missing, not_integer)
+    missing / not_integer는 연·월·일 중 하나라도 결측값 / 정수가 아닌 값인지 여부입니다.
+    """
+    converted = [_as_int_array(values) for values in (years, months, days)]
+    arrays = [array for array, _, _ in converted] + list(extra)
+    flags = [flag for _, missing, not_integer in converted for flag in (missing, not_integer)]
+    broadcast = [np.atleast_1d(array).copy() for array in np.broadcast_arrays(*arrays, *flags)]
+    flags = broadcast[len(arrays):]
+    missing = flags[0] | flags[2] | flags[4]
+    not_integer = flags[1] | flags[3] | flags[5]
+    return (*broadcast[:len(arrays)], missing, not_integer)
+
+
+def _as_leap_array(values):
+    """윤달 여부를 bool 배열로 바꿉니다. DB와 같은 '윤'/'평' 문자열도 받습니다."""
+    array = np.asarray(values)
+    if array.dtype.kind in ('U', 'S'):
+        return array == '윤'
+    if array.dtype.kind == 'O':
+        # 문자열과 bool이 섞여 있거나 결측값(None, pd.NA)이 있는 경우입니다. 결측값은 평달로 봅니다.
+        return pd.Series(array.ravel()).isin(['윤', True]).to_numpy().reshape(array.shape)
+    return array.astype(bool)
+
+
+def _result_index(*values):
+    """입력 중 pandas Series가 있으면 그 인덱스를 결과에 그대로 사용합니다."""
+    for value in values:
+        if isinstance(value, pd.Series):
+            return value.index
+    return None
+
+
+# --- 2. 변환 색인 만들기 ---
+
+def build_converter(df):
+    """
+    _read_calendar_data()와 같은 형태의 DataFrame으로 양방향 변환 색인을 만듭니다.
+    반환값은 다음 배열들을 담은 딕셔너리입니다.
+    - 'solar_days': 정렬된 양력 일수 / 'solar_lunar_*': 같은 순서의 음력 연·월·일·윤달 여부
+    - 'lunar_keys': 정렬된 음력 날짜 키 / 'lunar_solar_days': 같은 순서의 양력 일수
+    - 'month_keys': 정렬된 음력 달 키 / 'month_lengths': 그 달의 날 수
+    """
+    table = df[['solar_year', 'solar_month', 'solar_day', 'lunar_year', 'lunar_month', 'lunar_day']].copy()
+    table['is_leap'] = (df['is_leap'] == '윤')
+    table = table.dropna().astype({col: np.int64 for col in table.columns if col != 'is_leap'})
+    if table.empty:
+        raise ValueError("변환 색인을 만들 수 있는 날짜 데이터가 없습니다.")
+
+    solar_days = _days_from_civil(table['solar_year'].to_numpy(), table['solar_month'].to_numpy(), table['solar_day'].to_numpy())
+    lunar_years = table['lunar_year'].to_numpy()
+    lunar_months = table['lunar_month'].to_numpy()
+    lunar_days = table['lunar_day'].to_numpy()
+    lunar_leap = table['is_leap'].to_numpy()
+    lunar_keys = _lunar_day_key(lunar_years, lunar_months, lunar_days, lunar_leap)
+
+    solar_order = np.argsort(solar_days, kind='stable')
+    lunar_order = np.argsort(lunar_keys, kind='stable')
+
+    # 음력 달마다 가장 큰 '일'이 그 달의 날 수입니다. (큰 달 30일, 작은 달 29일)
+    month_keys = _lunar_month_key(lunar_years, lunar_months, lunar_leap)
+    month_series = pd.Series(lunar_days).groupby(month_keys).max()
+    # DB의 처음과 마지막 달은 중간에서 잘려 있을 수 있어 실제 날 수를 알 수 없습니다.
+    # 30일로 두어 '날짜 없음'으로 단정하지 않고, 색인에 없는 날짜는 범위 밖(out_of_range)이 되도록 합니다.
+    boundary_months = month_keys[solar_order[[0, -1]]]
+    month_series[boundary_months] = 30
+
+    return {
+        'solar_days': solar_days[solar_order],
+        'solar_lunar_year': lunar_years[solar_order],
+        'solar_lunar_month': lunar_months[solar_order],
+        'solar_lunar_day': lunar_days[solar_order],
+        'solar_lunar_leap': lunar_leap[solar_order],
+        'lunar_keys': lunar_keys[lunar_order],
+        'lunar_solar_days': solar_days[lunar_order],
+        'month_keys': month_series.index.to_numpy(dtype=np.int64),
+        'month_lengths': month_series.to_numpy(dtype=np.int64),
+    }
+
+
+def load_converter(db_path='manse_db.sqlite'):
+    """만세력 DB 파일을 읽어 변환 색인을 만듭니다."""
+    from utils import _read_calendar_data
+
+    return build_converter(_read_calendar_data(db_path))
+
+
+def _find(sorted_keys, queries):
+    """정렬된 키 배열에서 queries의 위치와 일치 여부를 구합니다."""
+    positions = np.searchsorted(sorted_keys, queries)
+    clipped = np.minimum(positions, len(sorted_keys) - 1)
+    found = (positions < len(sorted_keys)) & (sorted_keys[clipped] == queries)
+    return clipped, found
+
+
+# --- 3. 변환 API ---
+
+def solar_to_lunar(converter, years, months, days):
+    """
+    양력 날짜들을 음력으로 바꿉니다. 인자는 같은 길이의 배열(리스트, numpy 배열, pandas Series) 또는 단일 값입니다.
+    반환값: lunar_year, lunar_month, lunar_day, is_leap, status 컬럼을 가진 DataFrame
+    """
+    index = _result_index(years, months, days)
+    years, months, days, missing, not_integer = _as_date_arrays(years, months, days)
+
+    valid = ~missing & ~not_integer & _is_valid_solar(years, months, days)
+    positions, found = _find(converter['solar_days'], _days_from_civil(years, months, days))
+    found &= valid
+
+    status = np.where(found, STATUS_OK, np.where(valid, STATUS_OUT_OF_RANGE, STATUS_INVALID_DATE))
+    status[missing] = STATUS_MISSING
+    result = pd.DataFrame({
+        'lunar_year': pd.array(np.where(found, converter['solar_lunar_year'][positions], 0), dtype='Int64'),
+        'lunar_month': pd.array(np.where(found, converter['solar_lunar_month'][positions], 0), dtype='Int64'),
+        'lunar_day': pd.array(np.where(found, converter['solar_lunar_day'][positions], 0), dtype='Int64'),
+        'is_leap': pd.array(converter['solar_lunar_leap'][positions], dtype='boolean'),
+        'status': status,
+    }, index=index)
+    result.loc[~found, ['lunar_year', 'lunar_month', 'lunar_day', 'is_leap']] = pd.NA
+    return result
+
+
+def lunar_to_solar(converter, years, months, days, is_leap=False, policy='strict'):
+    """
+    음력 날짜들을 양력으로 바꿉니다. is_leap은 bool 또는 '윤'/'평' 값(배열 또는 단일 값)입니다.
+    policy:
+    - 'strict': 윤달이 없는 해의 윤달(no_leap_month), 작은 달의 30일(nonexistent_day)은 변환하지 않고 상태만 표시합니다.
+    - 'nearest': 위 두 경우를 각각 같은 달의 평달, 그 달의 말일로 바꾸어 변환하고 상태를 'adjusted'로 표시합니다.
+      (예: 음력 생일을 매년 양력으로 알려줄 때 사용)
+    반환값: solar_year, solar_month, solar_day, status 컬럼을 가진 DataFrame
+    """
+    if policy not in ('strict', 'nearest'):
+        raise ValueError(f"policy는 'strict' 또는 'nearest'여야 합니다: {policy!r}")
+
+    index = _result_index(years, months, days, is_leap)
+    years, months, days, leap, missing, not_integer = _as_date_arrays(years, months, days, _as_leap_array(is_leap))
+
+    status = np.full(years.shape, STATUS_OK, dtype=object)
+    valid = ~missing & ~not_integer & (months >= 1) & (months <= 12) & (days >= 1) & (days <= 30)
+    status[~valid] = STATUS_INVALID_DATE
+    status[missing] = STATUS_MISSING
+
+    # 달 단위로 먼저 확인하여, 변환이 안 되는 이유(윤달 없음 / 날짜 없음 / 범위 밖)를 구분합니다.
+    month_keys = converter['month_keys']
+    month_positions, month_found = _find(month_keys, _lunar_month_key(years, months, leap))
+    month_lengths = np.where(month_found, converter['month_lengths'][month_positions], 0)
+
+    no_leap_month = valid & leap & ~month_found
+    if no_leap_month.any():
+        # 윤달이 없는 해라도 같은 번호의 평달이 범위 안에 있을 때만 '윤달 없음'으로 봅니다.
+        _, regular_found = _find(month_keys, _lunar_month_key(years, months, False))
+        no_leap_month &= regular_found
+    status[no_leap_month] = STATUS_NO_LEAP_MONTH
+    status[valid & ~month_found & ~no_leap_month] = STATUS_OUT_OF_RANGE
+    nonexistent_day = valid & month_found & (days > month_lengths)
+    status[nonexistent_day] = STATUS_NONEXISTENT_DAY
+
+    if policy == 'nearest':
+        leap[no_leap_month] = False
+        regular_positions, regular_found = _find(month_keys, _lunar_month_key(years, months, leap))
+        regular_lengths = np.where(regular_found, converter['month_lengths'][regular_positions], 0)
+        adjust_day = (no_leap_month | nonexistent_day) & (days > regular_lengths)
+        days[adjust_day] = regular_lengths[adjust_day]
+        status[no_leap_month | nonexistent_day] = STATUS_ADJUSTED
+
+    positions, found = _find(converter['lunar_keys'], _lunar_day_key(years, months, days, leap))
+    converted = found & np.isin(status, (STATUS_OK, STATUS_ADJUSTED))
+    # 달은 있지만 DB가 그 달 중간에서 시작/끝나는 경우처럼, 색인에 없는 나머지 날짜는 범위 밖으로 처리합니다.
+    # (policy='nearest'로 조정한 날짜도 DB 경계에서 잘린 달이면 색인에 없을 수 있습니다.)
+    status[np.isin(status, (STATUS_OK, STATUS_ADJUSTED)) & ~found] = STATUS_OUT_OF_RANGE
+
+    solar_years, solar_months, solar_days = _civil_from_days(converter['lunar_solar_days'][positions])
+    result = pd.DataFrame({
+        'solar_year': pd.array(solar_years, dtype='Int64'),
+        'solar_month': pd.array(solar_months, dtype='Int64'),
+        'solar_day': pd.array(solar_days, dtype='Int64'),
+        'status': status.astype(str),
+    }, index=index)
+    result.loc[~converted, ['solar_year', 'solar_month', 'solar_day']] = pd.NA
+    return result
+
+
+# --- 명령줄 도구 ---
+
+def run_bench(args):
+    start = time.perf_counter()
+    converter = load_converter(args.db)
+    print(f"변환 색인 생성: {len(converter['solar_days']):,}일, {time.perf_counter() - start:.2f}초")
+
+    rng = np.random.default_rng(args.seed)
+    sample = rng.integers(0, len(converter['solar_days']), size=args.count)
+    solar_years, solar_months, solar_days = _civil_from_days(converter['solar_days'][sample])
+
+    start = time.perf_counter()
+    lunar = solar_to_lunar(converter, solar_years, solar_months, solar_days)
+    solar_to_lunar_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solar = lunar_to_solar(converter, lunar['lunar_year'].to_numpy(dtype=np.int64),
+                           lunar['lunar_month'].to_numpy(dtype=np.int64),
+                           lunar['lunar_day'].to_numpy(dtype=np.int64),
+                           lunar['is_leap'].to_numpy(dtype=bool))
+    lunar_to_solar_sec = time.perf_counter() - start
+
+    round_trip_ok = ((solar['solar_year'].to_numpy() == solar_years) & (solar['solar_month'].to_numpy() == solar_months)
+                     & (solar['solar_day'].to_numpy() == solar_days)).all()
+    print(f"양력 → 음력 {args.count:,}건: {solar_to_lunar_sec:.2f}초")
+    print(f"음력 → 양력 {args.count:,}건: {lunar_to_solar_sec:.2f}초")
+    print(f"왕복 변환 일치: {'예' if round_trip_ok else '아니오'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="양력/음력 일괄 변환 도구")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    bench_parser = subparsers.add_parser('bench', help="무작위 날짜를 양방향으로 일괄 변환하여 속도를 측정합니다.")
+    bench_parser.add_argument('--db', default='manse_db.sqlite')
+    bench_parser.add_argument('--count', type=int, default=1_000_000)
+    bench_parser.add_argument('--seed', type=int, default=0)
+    bench_parser.set_defaults(func=run_bench)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,10 @@
 CHEONGAN = list("甲乙丙丁戊己庚辛壬癸")
 # 지지(地支): 12개의 땅 기운
 JIJI = list("子丑寅卯辰巳午未申酉戌亥")
+# 육십갑자(六十甲子): 천간과 지지를 차례로 짝지은 60개의 간지. 리스트의 인덱스(0~59)가 간지 코드로 사용됩니다.
+GANJEE_60 = [CHEONGAN[i % 10] + JIJI[i % 12] for i in range(60)]
+# 간지 문자열(예: '甲子')에서 간지 코드(예: 0)를 찾기 위한 딕셔너리
+GANJEE_TO_CODE = {ganjee: code for code, ganjee in enumerate(GANJEE_60)}
 # 지지와 12간지(띠)를 연결하는 딕셔너리
 JIJI_TO_ZODIAC = {
     "子": "쥐", "丑": "소", "寅": "호랑이", "卯": "토끼", "辰": "용", "巳": "뱀",
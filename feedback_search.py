@@ -0,0 +1,144 @@
+# 파일 역할: feedback_search.py
+# 이 파일은 피드백 기록을 빠르게 검색하기 위한 '글자 단위 n-gram 역색인(inverted index)'을 담당합니다.
+# 한국어는 띄어쓰기 단위(어절)에 조사가 붙어 단어 검색이 어렵기 때문에, 어절을 두 글자씩 잘라(bigram) 색인합니다.
+# 예: "윤달을 선택하면" → "윤달", "달을", "선택", "택하", "하면" (+ 한 글자 검색을 위한 낱글자)
+#
+# 색인은 피드백이 저장될 때마다 해당 항목만 추가/수정(증분 갱신)하며, 화면이 다시 그려질 때마다 새로 만들지 않습니다.
+# 검색 결과는 질의의 모든 n-gram을 포함하고 실제로 질의 어절이 본문에 들어 있는 항목만 남긴 뒤,
+# TF-IDF 점수(드문 n-gram일수록 가중치가 큼)가 높은 순, 같은 점수이면 최신 순으로 정렬합니다.
+
+import math
+import threading
+
+
+def _normalize(text):
+    """검색을 위해 영문은 소문자로 바꾸고, 공백 기준으로 어절 목록을 만듭니다."""
+    return text.lower().split()
+
+
+def _ngrams(tokens):
+    """어절 목록에서 낱글자와 두 글자(bigram) 조각을 모두 뽑아 {조각: 등장 횟수} 딕셔너리로 반환합니다."""
+    counts = {}
+    for token in tokens:
+        for char in token:
+            counts[char] = counts.get(char, 0) + 1
+        for i in range(len(token) - 1):
+            gram = token[i:i + 2]
+            counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+def _query_grams(tokens):
+    """질의 어절에서 검색에 사용할 조각을 뽑습니다. 두 글자 이상인 어절은 bigram만, 한 글자 어절은 낱글자를 사용합니다."""
+    grams = set()
+    for token in tokens:
+        if len(token) == 1:
+            grams.add(token)
+        else:
+            grams.update(token[i:i + 2] for i in range(len(token) - 1))
+    return grams
+
+
+class FeedbackSearchIndex:
+    """
+    피드백 본문(text)에 대한 n-gram 역색인입니다.
+    - postings: {n-gram: {피드백 id: 등장 횟수}}
+    - docs: {피드백 id: {'tokens': 정규화된 어절 목록, 'status': 상태, 'order': 저장 순서}}
+    여러 사용자 세션이 같은 색인을 공유하므로, 모든 읽기/쓰기는 잠금(lock) 안에서 수행합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.postings = {}
+        self.docs = {}
+        self._next_order = 0
+        # 색인이 마지막으로 반영한 피드백 파일의 수정 시각. 다른 경로로 파일이 바뀌었는지 확인하는 데 사용합니다.
+        self.source_mtime = None
+
+    def rebuild(self, feedback_list, source_mtime=None):
+        """피드백 목록 전체로 색인을 새로 만듭니다. 목록은 최신 항목이 앞에 오는 파일 순서를 따릅니다."""
+        with self._lock:
+            self.postings = {}
+            self.docs = {}
+            self._next_order = 0
+            # 오래된 항목부터 넣어야 'order'가 저장 순서와 같아집니다.
+            for feedback in reversed(feedback_list):
+                self._add_locked(feedback)
+            self.source_mtime = source_mtime
+
+    def add(self, feedback, source_mtime=None):
+        """새 피드백 한 건을 색인에 추가합니다. 같은 id가 이미 있으면 내용을 교체합니다."""
+        with self._lock:
+            self._add_locked(feedback)
+            if source_mtime is not None:
+                self.source_mtime = source_mtime
+
+    def set_status(self, feedback_id, status, source_mtime=None):
+        """피드백의 상태('open'/'resolved')만 바꿉니다. 본문이 그대로이므로 n-gram은 다시 계산하지 않습니다."""
+        with self._lock:
+            if feedback_id in self.docs:
+                self.docs[feedback_id]['status'] = status
+            if source_mtime is not None:
+                self.source_mtime = source_mtime
+
+    def search(self, query, status=None, limit=None):
+        """
+        질의와 일치하는 피드백 id 목록을 점수가 높은 순으로 반환합니다.
+        status가 주어지면 해당 상태의 피드백만 남깁니다. 질의가 비어 있으면 빈 목록을 반환합니다.
+        """
+        query_tokens = _normalize(query)
+        grams = _query_grams(query_tokens)
+        if not grams:
+            return []
+
+        with self._lock:
+            # 가장 짧은 postings부터 교집합을 구해 후보를 빠르게 줄입니다.
+            posting_lists = sorted((self.postings.get(gram, {}) for gram in grams), key=len)
+            if not posting_lists[0]:
+                return []
+            candidates = set(posting_lists[0])
+            for postings in posting_lists[1:]:
+                candidates &= postings.keys()
+                if not candidates:
+                    return []
+
+            num_docs = len(self.docs)
+            idf = {gram: math.log(num_docs / len(self.postings[gram])) + 1.0 for gram in grams}
+            scored = []
+            for feedback_id in candidates:
+                doc = self.docs[feedback_id]
+                if status is not None and doc['status'] != status:
+                    continue
+                # bigram이 모두 있어도 서로 떨어져 있을 수 있으므로, 질의 어절이 실제로 들어 있는지 확인합니다.
+                if not all(any(query_token in token for token in doc['tokens']) for query_token in query_tokens):
+                    continue
+                score = sum(self.postings[gram][feedback_id] * idf[gram] for gram in grams)
+                scored.append((score, doc['order'], feedback_id))
+
+        scored.sort(reverse=True)
+        ids = [feedback_id for _, _, feedback_id in scored]
+        return ids[:limit] if limit is not None else ids
+
+    def _add_locked(self, feedback):
+        feedback_id = feedback_id_of(feedback)
+        if feedback_id in self.docs:
+            self._remove_locked(feedback_id)
+        tokens = _normalize(feedback.get('text', ''))
+        for gram, count in _ngrams(tokens).items():
+            self.postings.setdefault(gram, {})[feedback_id] = count
+        self.docs[feedback_id] = {'tokens': tokens, 'status': feedback.get('status', 'open'), 'order': self._next_order}
+        self._next_order += 1
+
+    def _remove_locked(self, feedback_id):
+        doc = self.docs.pop(feedback_id)
+        for gram in _ngrams(doc['tokens']):
+            postings = self.postings.get(gram)
+            if postings is not None:
+                postings.pop(feedback_id, None)
+                if not postings:
+                    del self.postings[gram]
+
+
+def feedback_id_of(feedback):
+    """피드백 항목의 고유 id를 반환합니다. id가 없는 예전 항목은 타임스탬프를 id로 사용합니다."""
+    return feedback.get('id') or feedback['timestamp']
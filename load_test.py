@@ -0,0 +1,298 @@
+# 파일 역할: load_test.py
+# 이 파일은 여러 명의 상담사가 동시에 앱을 사용하는 상황을 흉내 내는 '부하 테스트' 도구입니다.
+# Streamlit의 앱 테스트 API(streamlit.testing.v1.AppTest)로 manse_app.py를 브라우저 없이 실행하며,
+# 세션마다 별도의 프로세스에서 다음 시나리오를 반복합니다:
+#   날짜 입력 → 만세력 조회 → 인쇄 설정 변경 및 저장 → 인쇄 → 피드백 제출
+# (AppTest는 실행할 때마다 Streamlit의 전역 Runtime을 만들고 지우므로, 한 프로세스에서 여러 개를 동시에 실행할 수 없습니다.
+#  모든 세션 프로세스는 같은 작업 폴더의 DB / settings.json / feedback.json을 함께 사용합니다.)
+#
+# 실제 만세력 DB 대신 임시 폴더에 합성(synthetic) DB를 만들어 사용하므로, 운영 중인 파일은 건드리지 않습니다.
+# 결과로 다음 항목을 보고합니다:
+# - 동작별 재실행(rerun) 지연 시간의 백분위수 (p50/p90/p99/최대)
+# - 세션 프로세스의 최대 메모리 사용량(peak RSS)
+# - feedback.json / settings.json 쓰기 충돌: 읽는 도중 깨진 JSON이 보인 횟수, 저장했지만 사라진 피드백 수
+#
+# 사용법:
+#   python load_test.py [--sessions 50] [--iterations 3] [--keep-workdir]
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from constants import GANJEE_60
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'manse_app.py')
+
+# 합성 DB의 날짜 범위 (실제 DB의 지원 범위와 같게 맞춥니다)
+SYNTHETIC_START = date(1900, 1, 31)
+SYNTHETIC_END = date(2050, 12, 31)
+
+# 앱의 각 동작에 대한 재실행 시간 제한 (초)
+RERUN_TIMEOUT = 60
+
+
+# --- 1. 합성 만세력 DB 생성 ---
+
+def create_synthetic_db(path, start=SYNTHETIC_START, end=SYNTHETIC_END):
+    """
+    실제 DB와 같은 'calenda_data' 테이블 구조를 가진 합성 DB를 만듭니다.
+    일주는 실제와 같은 60일 주기로 계산하지만, 연주/월주/음력 날짜는 부하 테스트용으로 단순화한 값입니다.
+    만들어진 행 수를 반환합니다.
+    """
+    columns = ['cd_sgi', 'cd_sy', 'cd_sm', 'cd_sd', 'cd_ly', 'cd_lm', 'cd_ld', 'cd_is_yun',
+               'cd_hyganjee', 'cd_kyganjee', 'cd_hmganjee', 'cd_kmganjee', 'cd_hdganjee', 'cd_kdganjee', 'holiday']
+    # 1900-01-01은 갑술(甲戌, 코드 10)일입니다.
+    day_code_base = date(1900, 1, 1).toordinal() - 10
+
+    rows = []
+    lunar_year, lunar_month, lunar_day, is_leap = start.year, 1, 1, False
+    current = start
+    while current <= end:
+        year_ganjee = GANJEE_60[(current.year - 4) % 60]
+        month_ganjee = GANJEE_60[((current.year - 1900) * 12 + current.month + 13) % 60]
+        day_ganjee = GANJEE_60[(current.toordinal() - day_code_base) % 60]
+        rows.append((
+            str(current.year), str(current.year), str(current.month), str(current.day),
+            str(lunar_year), str(lunar_month), str(lunar_day), '윤' if is_leap else '평',
+            year_ganjee, '', month_ganjee, '', day_ganjee, '', ''
+        ))
+
+        # 홀수 달은 30일, 짝수 달은 29일로 두고, 3년마다 5월 뒤에 윤5월을 넣습니다.
+        lunar_day += 1
+        if lunar_day > (30 if lunar_month % 2 else 29):
+            lunar_day = 1
+            if lunar_month == 5 and lunar_year % 3 == 0 and not is_leap:
+                is_leap = True
+            else:
+                is_leap = False
+                lunar_month += 1
+                if lunar_month > 12:
+                    lunar_month, lunar_year = 1, lunar_year + 1
+        current += timedelta(days=1)
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute(f"CREATE TABLE calenda_data ({', '.join(col + ' TEXT' for col in columns)})")
+        conn.executemany(f"INSERT INTO calenda_data VALUES ({', '.join('?' * len(columns))})", rows)
+        conn.commit()
+    finally:
+        conn.close()
+    return len(rows)
+
+
+# --- 2. 파일 충돌 감시 ---
+
+def watch_json_files(paths, stop_event, counters):
+    """
+    stop_event가 설정될 때까지 JSON 파일들을 계속 읽어, 깨진(파싱할 수 없는) 상태가 보인 횟수를 셉니다.
+    저장이 원자적이지 않으면 다른 세션이 쓰는 도중의 내용을 읽게 되어 이 수치가 올라갑니다.
+    """
+    while not stop_event.is_set():
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    json.load(f)
+                counters[path]['reads'] += 1
+            except FileNotFoundError:
+                pass
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                counters[path]['reads'] += 1
+                counters[path]['torn_reads'] += 1
+        time.sleep(0.002)
+
+
+# --- 3. 세션 시나리오 ---
+
+def _find(elements, label):
+    """라벨로 위젯을 찾습니다. (앱의 대부분 위젯에는 key가 없으므로 라벨을 사용합니다.)"""
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"위젯을 찾을 수 없습니다: {label}")
+
+
+def _timed_run(at, action, timings):
+    """앱을 한 번 재실행하고 걸린 시간을 동작 이름별로 기록합니다."""
+    start = time.perf_counter()
+    at.run(timeout=RERUN_TIMEOUT)
+    timings.append((action, time.perf_counter() - start))
+    if at.exception:
+        raise RuntimeError(f"{action}: {at.exception[0].message}")
+
+
+def _peak_rss_mib():
+    """현재 프로세스의 최대 메모리 사용량(peak RSS)을 MiB로 반환합니다. (Linux의 ru_maxrss는 KiB, macOS는 바이트 단위)"""
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss / 1024 / 1024 if sys.platform == 'darwin' else peak_rss / 1024
+
+
+def run_session(session_id, iterations, seed):
+    """
+    한 명의 사용자(세션)가 시나리오를 iterations번 반복합니다. 세션마다 별도의 프로세스에서 실행됩니다.
+    반환값: (재실행 시간 목록, 제출한 피드백 문구 목록, 재실행이 실패한 제출 수, 오류 목록, 프로세스의 peak RSS(MiB))
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    timings, submitted, errors = [], [], []
+    failed_submits = 0
+    at = AppTest.from_file(APP_FILE, default_timeout=RERUN_TIMEOUT)
+    try:
+        _timed_run(at, 'initial', timings)
+    except Exception as e:
+        errors.append(f"session {session_id}: {e}")
+        return timings, submitted, failed_submits, errors, _peak_rss_mib()
+
+    for i in range(iterations):
+        # 한 번의 반복에서 오류가 나도 세션은 계속 진행하여, 오류가 부하 전체를 멈추지 않도록 합니다.
+        try:
+            # 1. 날짜 입력 및 조회
+            birth_date = SYNTHETIC_START + timedelta(days=rng.randrange((SYNTHETIC_END - SYNTHETIC_START).days))
+            _find(at.text_input, "생년월일").input(birth_date.strftime('%Y%m%d'))
+            _find(at.text_input, "직접 입력").input(f"{rng.randrange(24):02d}{rng.randrange(60):02d}")
+            _timed_run(at, 'date_entry', timings)
+            _find(at.button, "만세력 정보 조회하기").click()
+            _timed_run(at, 'lookup', timings)
+            if not at.session_state['result_data']:
+                messages = ', '.join(element.value for element in at.error) or '오류 메시지 없음'
+                errors.append(f"session {session_id}: {birth_date} 조회 실패 ({messages})")
+
+            # 2. 인쇄 설정 변경 및 저장
+            top = at.number_input(key="p_b_top")
+            top.set_value(top.value + rng.choice([-1.0, 1.0]))
+            _timed_run(at, 'settings_change', timings)
+            at.button(key="save_settings_btn").click()
+            _timed_run(at, 'settings_save', timings)
+
+            # 3. 인쇄
+            _find(at.button, "인쇄하기").click()
+            _timed_run(at, 'print', timings)
+
+            # 4. 피드백 제출
+            text = f"loadtest session={session_id} iteration={i} nonce={rng.random():.12f}"
+            _find(at.text_area, "내용 입력:").input(text)
+            at.button(key="submit_feedback").click()
+            try:
+                _timed_run(at, 'feedback_submit', timings)
+            except Exception:
+                # 재실행이 실패하면 저장까지 갔는지 알 수 없으므로, 사라진 피드백 집계에서 빼고 따로 셉니다.
+                failed_submits += 1
+                raise
+            submitted.append(text)
+        except Exception as e:
+            errors.append(f"session {session_id}: {e!r}")
+    return timings, submitted, failed_submits, errors, _peak_rss_mib()
+
+
+# --- 4. 결과 보고 ---
+
+def _percentile(sorted_values, q):
+    """정렬된 값 목록에서 q 백분위수를 구합니다. (최근접 순위 방식)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def print_report(timings, elapsed, counters, lost_feedback, total_feedback, failed_submits, errors, num_sessions, session_peak_rss):
+    by_action = {}
+    for action, seconds in timings:
+        by_action.setdefault(action, []).append(seconds * 1000)
+    by_action['(전체)'] = [seconds * 1000 for _, seconds in timings]
+
+    print(f"\n세션 {num_sessions}개, 재실행 {len(timings):,}회, 총 {elapsed:.1f}초")
+    print(f"{'동작':<18}{'횟수':>7}{'p50':>10}{'p90':>10}{'p99':>10}{'최대':>10}  (ms)")
+    for action, values in by_action.items():
+        values.sort()
+        print(f"{action:<18}{len(values):>7}{_percentile(values, 50):>10.1f}{_percentile(values, 90):>10.1f}"
+              f"{_percentile(values, 99):>10.1f}{values[-1]:>10.1f}")
+
+    if session_peak_rss:
+        print(f"\n세션 프로세스 최대 메모리 사용량(peak RSS): 최대 {max(session_peak_rss):.1f} MiB, "
+              f"평균 {sum(session_peak_rss) / len(session_peak_rss):.1f} MiB")
+
+    print("\n파일 쓰기 충돌")
+    for path, counter in counters.items():
+        print(f"  {os.path.basename(path)}: 읽기 {counter['reads']:,}회 중 깨진 JSON {counter['torn_reads']:,}회")
+    print(f"  feedback.json: 제출 {total_feedback:,}건 중 사라진 피드백 {lost_feedback:,}건")
+    if failed_submits:
+        print(f"  feedback.json: 재실행이 실패해 저장 여부를 확인하지 않은 제출 {failed_submits:,}건")
+
+    if errors:
+        # 같은 오류가 여러 세션에서 반복되는 경우가 많으므로, 세션 번호를 떼고 종류별로 묶어 보여줍니다.
+        grouped = {}
+        for error in errors:
+            message = error.split(': ', 1)[-1]
+            grouped[message] = grouped.get(message, 0) + 1
+        print(f"\n오류 {len(errors)}건 ({len(grouped)}종류)")
+        for message, count in sorted(grouped.items(), key=lambda item: -item[1])[:20]:
+            print(f"  {count:>5}회  {message[:200]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 세션이 동시에 manse_app.py를 사용하는 부하 테스트를 실행합니다.")
+    parser.add_argument('--sessions', type=int, default=50, help="동시에 실행할 세션 수")
+    parser.add_argument('--iterations', type=int, default=3, help="세션마다 시나리오를 반복할 횟수")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keep-workdir', action='store_true', help="테스트가 끝난 뒤 임시 작업 폴더를 지우지 않습니다.")
+    args = parser.parse_args()
+
+    # 앱은 현재 폴더의 manse_db.sqlite / settings.json / feedback.json을 사용하므로, 임시 폴더로 이동한 뒤 실행합니다.
+    workdir = tempfile.mkdtemp(prefix='manse_loadtest_')
+    original_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        num_rows = create_synthetic_db('manse_db.sqlite')
+        print(f"작업 폴더: {workdir} (합성 DB {num_rows:,}행)")
+
+        watched = [os.path.join(workdir, 'feedback.json'), os.path.join(workdir, 'settings.json')]
+        counters = {path: {'reads': 0, 'torn_reads': 0} for path in watched}
+        stop_event = threading.Event()
+        watcher = threading.Thread(target=watch_json_files, args=(watched, stop_event, counters), daemon=True)
+        watcher.start()
+
+        # 세션마다 새 프로세스를 띄웁니다. (spawn: 부모의 스레드/Streamlit 상태를 물려받지 않음, maxtasksperchild=1: 프로세스 하나에 세션 하나)
+        # 자식 프로세스는 현재 폴더(작업 폴더)를 물려받으므로 모두 같은 파일을 사용합니다.
+        start = time.perf_counter()
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(processes=args.sessions, maxtasksperchild=1) as pool:
+            results = pool.starmap(run_session, [(session_id, args.iterations, args.seed * 100003 + session_id)
+                                                 for session_id in range(args.sessions)], chunksize=1)
+        elapsed = time.perf_counter() - start
+        stop_event.set()
+        watcher.join()
+
+        timings = [timing for result in results for timing in result[0]]
+        submitted = [text for result in results for text in result[1]]
+        failed_submits = sum(result[2] for result in results)
+        errors = [error for result in results for error in result[3]]
+        session_peak_rss = [result[4] for result in results]
+
+        try:
+            with open('feedback.json', 'r', encoding='utf-8') as f:
+                saved_texts = {entry.get('text') for entry in json.load(f)}
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            errors.append(f"feedback.json을 읽을 수 없습니다: {e}")
+            saved_texts = set()
+        lost_feedback = sum(1 for text in submitted if text not in saved_texts)
+
+        print_report(timings, elapsed, counters, lost_feedback, len(submitted), failed_submits, errors,
+                     args.sessions, session_peak_rss)
+    finally:
+        os.chdir(original_cwd)
+        if not args.keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
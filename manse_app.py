@@ -6,6 +6,7 @@
 import streamlit as st
 from datetime import datetime, timedelta, time
 import json
+import time as time_module  # datetime.time과 이름이 겹치지 않도록 별칭을 사용합니다.
 import utils  # 데이터 처리 및 만세력 계산 함수들이 들어있는 모듈
 import constants  # 앱 전체에서 사용되는 상수(고정값)들이 들어있는 모듈
 
@@ -19,13 +20,41 @@ DEFAULT_SETTINGS = {
 }
 
 # --- 설정 저장 함수 ---
+def get_current_settings():
+    """st.session_state에서 현재 인쇄 설정값(p_* 위치, f_* 글자 크기)을 읽어 딕셔너리로 반환합니다."""
+    # DEFAULT_SETTINGS의 키들을 기준으로 st.session_state에서 현재 설정값들을 가져와 딕셔너리를 만듭니다.
+    return {key: st.session_state[key] for key in DEFAULT_SETTINGS.keys()}
+
 def save_current_settings():
     """
-    st.session_state에서 현재 설정 값을 읽어 파일에 저장합니다.
+    st.session_state에서 현재 설정 값을 읽어, 선택된 프로필 이름으로 파일에 저장합니다.
     """
-    # DEFAULT_SETTINGS의 키들을 기준으로 st.session_state에서 현재 설정값들을 가져와 딕셔너리를 만듭니다.
-    current_settings = {key: st.session_state[key] for key in DEFAULT_SETTINGS.keys()}
-    utils.save_settings(current_settings)
+    return utils.save_settings(get_current_settings(), profile=st.session_state.print_profile, default_settings=DEFAULT_SETTINGS)
+
+def apply_selected_profile():
+    """프로필 선택이 바뀌면, 해당 프로필의 설정값을 입력 위젯(session_state)에 채워 넣습니다."""
+    settings = utils.load_settings(DEFAULT_SETTINGS, profile=st.session_state.print_profile)
+    for key in DEFAULT_SETTINGS.keys():
+        st.session_state[key] = settings[key]
+
+def save_as_new_profile():
+    """현재 설정값을 입력한 이름의 새 프로필로 저장하고, 그 프로필을 선택합니다."""
+    name = st.session_state.new_profile_name.strip()
+    if not name:
+        st.toast("새 프로필 이름을 입력해주세요.", icon="⚠️")
+        return
+    if utils.save_settings(get_current_settings(), profile=name, default_settings=DEFAULT_SETTINGS):
+        st.session_state.print_profile = name
+        st.session_state.new_profile_name = ""
+        st.toast(f"'{name}' 프로필로 저장되었습니다.", icon="💾")
+
+def delete_selected_profile():
+    """선택된 프로필을 삭제하고 기본 프로필로 돌아갑니다."""
+    name = st.session_state.print_profile
+    if utils.delete_profile(name, DEFAULT_SETTINGS):
+        st.session_state.print_profile = utils.DEFAULT_PROFILE_NAME
+        apply_selected_profile()
+        st.toast(f"'{name}' 프로필이 삭제되었습니다.", icon="🗑️")
 
 # --- Streamlit 페이지 설정 ---
 st.set_page_config(page_title="만세력 조회", layout="centered")
@@ -69,12 +98,32 @@ st.write("아래에 생년월일 정보를 입력해주세요.")
 st.write("") # 여백
 
 # --- 데이터 로딩 ---
-df = utils.load_data()
+# 전체 만세력 데이터는 백그라운드 스레드에서 불러옵니다. 로딩이 끝나기 전에는 df가 None이며,
+# 이때 들어오는 조회는 utils.calculate_manse_info가 SQLite에서 해당 날짜 한 행만 직접 읽어 처리합니다.
+warmup = utils.start_calendar_warmup()
+df = warmup['df']
+# 미리 계산된 사주 기둥 표 (선택 사항, 'python pillar_table.py build'로 생성). 없으면 None입니다.
+pillar_table = utils.load_pillar_table()
+
+@st.fragment(run_every=0.5)
+def show_warmup_progress():
+    """데이터 로딩 진행률을 표시하고, 로딩이 끝나면 앱 전체를 다시 실행하여 표시를 없앱니다."""
+    if warmup['ready'].is_set():
+        st.rerun()
+    st.progress(warmup['progress'], text="만세력 데이터를 준비하는 중입니다... (조회는 바로 사용할 수 있습니다)")
+
+if warmup['error'] is not None:
+    utils.show_data_load_error(warmup['error'])
+elif not warmup['ready'].is_set():
+    show_warmup_progress()
 
 # --- 메인 애플리케이션 로직 ---
-if df is not None:
+if warmup['error'] is None:
     # --- 설정 불러오기 및 session_state 초기화 ---
-    settings = utils.load_settings(DEFAULT_SETTINGS)
+    # 설정 파일은 수정 시각이 바뀌었을 때만 다시 읽으므로, 매번 실행되어도 부담이 거의 없습니다.
+    if 'print_profile' not in st.session_state:
+        st.session_state.print_profile = utils.DEFAULT_PROFILE_NAME
+    settings = utils.load_settings(DEFAULT_SETTINGS, profile=st.session_state.print_profile)
     for key, value in settings.items():
         if key not in st.session_state:
             st.session_state[key] = value
@@ -95,6 +144,25 @@ if df is not None:
 
     # --- '인쇄 설정' 탭 ---
     with tab2:
+        # 용지(양식) 종류별로 위치/크기 설정을 프로필로 저장해 두고 골라 쓸 수 있습니다.
+        st.subheader("인쇄 양식 프로필")
+        profile_names = utils.list_profiles(DEFAULT_SETTINGS)
+        if st.session_state.print_profile not in profile_names:
+            # 다른 세션에서 프로필이 삭제된 경우 기본 프로필로 돌아갑니다.
+            st.session_state.print_profile = utils.DEFAULT_PROFILE_NAME
+        profile_cols = st.columns([2, 1])
+        with profile_cols[0]:
+            st.selectbox("프로필", options=profile_names, key="print_profile", on_change=apply_selected_profile, label_visibility="collapsed")
+        with profile_cols[1]:
+            st.button("프로필 삭제", key="delete_profile_btn", on_click=delete_selected_profile,
+                      disabled=st.session_state.print_profile == utils.DEFAULT_PROFILE_NAME)
+        new_profile_cols = st.columns([2, 1])
+        with new_profile_cols[0]:
+            st.text_input("새 프로필 이름", key="new_profile_name", placeholder="새 프로필 이름 (예: 병원 접수증)", label_visibility="collapsed")
+        with new_profile_cols[1]:
+            st.button("새 프로필로 저장", key="save_as_profile_btn", on_click=save_as_new_profile)
+
+        st.markdown("---")
         st.subheader("인쇄 위치 조정 (mm 단위)")
         st.caption("A4 용지 기준, 좌측 상단 모서리로부터의 거리입니다.")
         pos_col1, pos_col2 = st.columns(2)
@@ -123,8 +191,8 @@ if df is not None:
         btn_col1, btn_col2 = st.columns(2)
         with btn_col1:
             if st.button("설정 저장하기", key="save_settings_btn"):
-                save_current_settings()
-                st.toast("설정이 저장되었습니다.", icon="💾")
+                if save_current_settings():
+                    st.toast(f"'{st.session_state.print_profile}' 프로필에 설정이 저장되었습니다.", icon="💾")
 
         with btn_col2:
             if st.button("설정 적용하여 인쇄하기", key="print_in_settings_tab"):
@@ -217,7 +285,8 @@ if df is not None:
                     cal_type=cal_type,
                     birth_region=birth_region,
                     blood_type_base=blood_type_base,
-                    is_rh_minus=is_rh_minus
+                    is_rh_minus=is_rh_minus,
+                    pillar_table=pillar_table
                 )
 
                 if error_msg:
@@ -285,7 +354,27 @@ if df is not None:
         if not feedback_list:
             st.info("아직 기록된 피드백이 없습니다.")
         else:
+            # 검색어와 상태 필터를 함께 적용합니다. 검색어가 있으면 관련도 순, 없으면 최신 순으로 표시합니다.
+            search_cols = st.columns([2, 1])
+            search_query = search_cols[0].text_input("피드백 검색", placeholder="예: 윤달, 시주", key="feedback_search")
+            status_label = search_cols[1].selectbox("상태", ("전체", "미해결", "해결"), key="feedback_status_filter")
+            status_filter = {"전체": None, "미해결": "open", "해결": "resolved"}[status_label]
+
+            if search_query.strip():
+                search_start = time_module.perf_counter()
+                matched_ids = utils.search_feedback(search_query, status_filter)
+                search_ms = (time_module.perf_counter() - search_start) * 1000
+                feedback_by_id = {utils.feedback_id_of(feedback): feedback for feedback in feedback_list}
+                feedback_list = [feedback_by_id[feedback_id] for feedback_id in matched_ids if feedback_id in feedback_by_id]
+                st.caption(f"검색 결과 {len(feedback_list)}건 ({search_ms:.1f}ms)")
+            elif status_filter is not None:
+                feedback_list = [feedback for feedback in feedback_list if feedback['status'] == status_filter]
+
+            if not feedback_list:
+                st.info("조건에 맞는 피드백이 없습니다.")
+
             for feedback in feedback_list:
+                feedback_id = utils.feedback_id_of(feedback)
                 timestamp = feedback['timestamp']
                 text = feedback['text']
                 status = feedback['status']
@@ -299,12 +388,12 @@ if df is not None:
                     
                     # 상태 변경 버튼
                     if status == 'open':
-                        if st.button("해결로 표시", key=f"resolve_{timestamp}", use_container_width=True):
-                            utils.update_feedback_status(timestamp, 'resolved')
+                        if st.button("해결로 표시", key=f"resolve_{feedback_id}", use_container_width=True):
+                            utils.update_feedback_status(feedback_id, 'resolved')
                             st.rerun()
                     else: # status == 'resolved'
-                        if st.button("다시 열기", key=f"reopen_{timestamp}", use_container_width=True):
-                            utils.update_feedback_status(timestamp, 'open')
+                        if st.button("다시 열기", key=f"reopen_{feedback_id}", use_container_width=True):
+                            utils.update_feedback_status(feedback_id, 'open')
                             st.rerun()
 
 
@@ -313,16 +402,7 @@ if df is not None:
     if st.session_state.get('do_print', False):
         # 인쇄할 데이터가 있는지 다시 한번 확인합니다.
         if st.session_state.result_data:
-            positions = {
-                "birth_date_top": st.session_state.p_b_top, "birth_date_left": st.session_state.p_b_left,
-                "manse_grid_top": st.session_state.p_s_top, "manse_grid_left": st.session_state.p_s_left,
-                "age_info_top": st.session_state.p_a_top, "age_info_left": st.session_state.p_a_left
-            }
-            font_sizes = {
-                "birth_date_fs": st.session_state.f_b_size,
-                "manse_grid_fs": st.session_state.f_s_size,
-                "age_info_fs": st.session_state.f_a_size
-            }
+            positions, font_sizes = utils.print_layout_from_settings(get_current_settings())
             print_html = utils.generate_print_html(st.session_state.result_data, positions, font_sizes)
             safe_html = json.dumps(print_html)
             js_code = f"""
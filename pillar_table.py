@@ -0,0 +1,240 @@
+# 파일 역할: pillar_table.py
+# 이 파일은 '미리 계산된 사주 기둥 표(pillar table)'를 만들고, 불러오고, 조회하는 기능을 담당합니다.
+# 지원하는 모든 양력 날짜 × 12지시에 대해 연주/월주/일주/시주를 미리 계산해 두면,
+# 조회할 때마다 DB 행을 찾고 시주를 계산하는 대신 배열 한 칸을 읽어 풀기만 하면 됩니다.
+#
+# 저장 형식:
+# - 각 기둥은 육십갑자 코드(0~59, constants.GANJEE_60의 인덱스)로 바꾸어 6비트에 담습니다.
+# - 네 기둥을 하나의 32비트 정수로 묶습니다: 연주 | 월주 << 6 | 일주 << 12 | 시주 << 18
+# - 배열의 위치는 (양력 날짜 서수 - 시작 날짜 서수) × 12 + 시지 인덱스 입니다.
+# - DB에 없는 날짜는 EMPTY_CODE로 채워집니다.
+# - 표를 만든 DB 내용의 해시(source)를 함께 저장합니다. 앱은 현재 DB와 해시가 다른 표는 사용하지 않습니다.
+# 띠(zodiac)는 연주의 지지에서 바로 구할 수 있으므로 따로 저장하지 않습니다.
+#
+# 사용법:
+#   python pillar_table.py build [--db manse_db.sqlite] [--out pillar_table.npz]
+#   python pillar_table.py bench [--db manse_db.sqlite] [--table pillar_table.npz] [--samples 20000]
+
+import argparse
+import hashlib
+import os
+import random
+import sqlite3
+import time
+from datetime import date
+
+import numpy as np
+
+from constants import CHEONGAN, JIJI, GANJEE_60, GANJEE_TO_CODE
+
+PILLAR_TABLE_FILE = 'pillar_table.npz'
+
+# 값이 없는 칸을 나타내는 코드 (6비트 필드 네 개로는 만들어질 수 없는 값)
+EMPTY_CODE = 0xFFFFFFFF
+
+# 필드 하나가 차지하는 비트 수와 마스크
+CODE_BITS = 6
+CODE_MASK = (1 << CODE_BITS) - 1
+
+# 결과 딕셔너리에서 사용하는 기둥 이름 (utils.calculate_manse_info와 동일)
+YEAR_KEY, MONTH_KEY, DAY_KEY, HOUR_KEY = "연주(年柱)", "월주(月柱)", "일주(日柱)", "시주(時柱)"
+
+
+def _build_hour_code_map():
+    """
+    일간(日干) 인덱스(0~9) × 시지 인덱스(0~11)에 해당하는 시주의 간지 코드를 담은 10×12 배열을 만듭니다.
+    시두법 계산은 utils.get_time_cheongan을 그대로 사용하여 실시간 계산과 결과가 항상 같도록 합니다.
+    """
+    from utils import get_time_cheongan
+
+    hour_codes = np.zeros((len(CHEONGAN), len(JIJI)), dtype=np.uint32)
+    for stem_index, stem in enumerate(CHEONGAN):
+        # 일간만 중요하므로, 해당 천간으로 시작하는 아무 간지(예: '甲子')나 일주로 사용합니다.
+        day_ganjee = GANJEE_60[stem_index]
+        for branch_index, branch in enumerate(JIJI):
+            hour_codes[stem_index, branch_index] = GANJEE_TO_CODE[get_time_cheongan(day_ganjee, branch) + branch]
+    return hour_codes
+
+
+def build_table(df):
+    """
+    _read_calendar_data()와 같은 형태의 DataFrame으로부터 기둥 표를 만듭니다.
+    반환값은 {'base_ordinal': 첫 날짜의 서수, 'codes': uint32 배열} 형태의 딕셔너리입니다.
+    """
+    dates = df[['solar_year', 'solar_month', 'solar_day']].dropna().astype(int)
+    codes_by_column = {
+        col: df.loc[dates.index, col].map(GANJEE_TO_CODE)
+        for col in ['year_ganjee_hj', 'month_ganjee_hj', 'day_ganjee_hj']
+    }
+    # 세 기둥이 모두 올바른 간지인 행만 사용합니다.
+    valid = codes_by_column['year_ganjee_hj'].notna() & codes_by_column['month_ganjee_hj'].notna() & codes_by_column['day_ganjee_hj'].notna()
+    dates = dates[valid]
+    if dates.empty:
+        raise ValueError("기둥 표를 만들 수 있는 날짜 데이터가 없습니다.")
+
+    ordinals = np.array([date(y, m, d).toordinal() for y, m, d in dates.itertuples(index=False)], dtype=np.int64)
+    year_codes, month_codes, day_codes = (codes_by_column[col][valid].to_numpy(dtype=np.uint32)
+                                          for col in ['year_ganjee_hj', 'month_ganjee_hj', 'day_ganjee_hj'])
+
+    base_ordinal = int(ordinals.min())
+    num_days = int(ordinals.max()) - base_ordinal + 1
+    table = np.full((num_days, len(JIJI)), EMPTY_CODE, dtype=np.uint32)
+
+    # 일간(일주 코드 % 10)과 시지로 12개 시주 코드를 한꺼번에 구합니다. (shape: 날짜 수 × 12)
+    hour_codes = _build_hour_code_map()[day_codes % 10]
+    date_codes = year_codes | (month_codes << CODE_BITS) | (day_codes << (CODE_BITS * 2))
+    table[ordinals - base_ordinal] = date_codes[:, None] | (hour_codes << (CODE_BITS * 3))
+
+    return {'base_ordinal': base_ordinal, 'codes': table.ravel()}
+
+
+def source_fingerprint(db_path):
+    """
+    기둥 표의 재료가 되는 DB 내용(양력 날짜와 연주/월주/일주)의 해시 값을 반환합니다.
+    인덱스를 새로 만드는 것처럼 내용과 무관한 변경에는 값이 바뀌지 않고, 날짜나 간지가 고쳐지면 바뀝니다.
+    """
+    # 파일이 없을 때 sqlite3.connect가 빈 DB를 새로 만들지 않도록 먼저 확인합니다.
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(db_path)
+    digest = hashlib.sha256()
+    conn = sqlite3.connect(db_path)
+    try:
+        for row in conn.execute("SELECT cd_sy, cd_sm, cd_sd, cd_hyganjee, cd_hmganjee, cd_hdganjee FROM calenda_data ORDER BY rowid"):
+            digest.update(repr(row).encode('utf-8'))
+    finally:
+        conn.close()
+    return digest.hexdigest()
+
+
+def save_table(table, path=PILLAR_TABLE_FILE):
+    """기둥 표를 압축하지 않은 .npz 파일로 저장합니다. table['source']가 있으면 함께 저장합니다."""
+    np.savez(path, base_ordinal=np.int64(table['base_ordinal']), codes=table['codes'], source=np.str_(table.get('source', '')))
+
+
+def load_table(path=PILLAR_TABLE_FILE):
+    """save_table()로 저장한 기둥 표를 불러옵니다. source가 없는 예전 파일은 source를 None으로 돌려줍니다."""
+    with np.load(path) as data:
+        source = str(data['source']) if 'source' in data.files else None
+        return {'base_ordinal': int(data['base_ordinal']), 'codes': np.ascontiguousarray(data['codes'], dtype=np.uint32),
+                'source': source or None}
+
+
+def lookup_pillars(table, solar_date, time_jiji=None):
+    """
+    양력 날짜와 시지(예: '午')로 기둥 표를 조회하여 calculate_manse_info와 같은 형태의 pillars 딕셔너리를 반환합니다.
+    time_jiji가 None이면 시주를 제외한 세 기둥만 반환합니다. 표에 없는 날짜이면 None을 반환합니다.
+    """
+    branch_index = JIJI.index(time_jiji) if time_jiji is not None else 0
+    position = (solar_date.toordinal() - table['base_ordinal']) * len(JIJI) + branch_index
+    if not (0 <= position < len(table['codes'])):
+        return None
+    packed = int(table['codes'][position])
+    if packed == EMPTY_CODE:
+        return None
+
+    pillars = {
+        YEAR_KEY: GANJEE_60[packed & CODE_MASK],
+        MONTH_KEY: GANJEE_60[(packed >> CODE_BITS) & CODE_MASK],
+        DAY_KEY: GANJEE_60[(packed >> (CODE_BITS * 2)) & CODE_MASK],
+    }
+    if time_jiji is not None:
+        pillars[HOUR_KEY] = GANJEE_60[(packed >> (CODE_BITS * 3)) & CODE_MASK]
+    return pillars
+
+
+# --- 명령줄 도구 ---
+
+def _live_pillars(df, solar_date, time_jiji):
+    """비교용: 표 없이 DataFrame 조회와 시주 계산으로 pillars 딕셔너리를 만듭니다."""
+    from utils import find_calendar_row, get_time_cheongan
+
+    row = find_calendar_row(df, "양력", solar_date.year, solar_date.month, solar_date.day)
+    if row is None:
+        return None
+    pillars = {YEAR_KEY: row['year_ganjee_hj'], MONTH_KEY: row['month_ganjee_hj'], DAY_KEY: row['day_ganjee_hj']}
+    if time_jiji is not None:
+        pillars[HOUR_KEY] = get_time_cheongan(row['day_ganjee_hj'], time_jiji) + time_jiji
+    return pillars
+
+
+def _percentile_us(samples, q):
+    """초 단위 측정값 목록에서 q 백분위수를 마이크로초로 반환합니다."""
+    return float(np.percentile(np.array(samples) * 1e6, q))
+
+
+def run_build(args):
+    from utils import _read_calendar_data
+
+    start = time.perf_counter()
+    df = _read_calendar_data(args.db)
+    table = build_table(df)
+    table['source'] = source_fingerprint(args.db)
+    save_table(table, args.out)
+    elapsed = time.perf_counter() - start
+    filled = int(np.count_nonzero(table['codes'] != EMPTY_CODE))
+    print(f"기둥 표 생성 완료: {args.out}")
+    print(f"  항목 수: {len(table['codes']):,} (값 있음 {filled:,}), 크기: {table['codes'].nbytes / 1024 / 1024:.2f} MiB")
+    print(f"  소요 시간: {elapsed:.2f}초")
+
+
+def run_bench(args):
+    from utils import _read_calendar_data
+
+    df = _read_calendar_data(args.db)
+    table = load_table(args.table)
+    codes = table['codes']
+    print(f"기둥 표: {len(codes):,} 항목, {codes.nbytes / 1024 / 1024:.2f} MiB (항목당 {codes.itemsize}바이트)")
+    print(f"DataFrame: {len(df):,} 행, {df.memory_usage(deep=True).sum() / 1024 / 1024:.2f} MiB")
+
+    # 표에 값이 있는 날짜 중에서 무작위로 (날짜, 시지) 조합을 뽑습니다.
+    rng = random.Random(args.seed)
+    filled_days = np.flatnonzero(codes[::len(JIJI)] != EMPTY_CODE)
+    queries = []
+    for _ in range(args.samples):
+        solar_date = date.fromordinal(table['base_ordinal'] + int(rng.choice(filled_days)))
+        time_jiji = rng.choice(JIJI + [None])
+        queries.append((solar_date, time_jiji))
+
+    timings = {'table': [], 'live': []}
+    mismatches = 0
+    for solar_date, time_jiji in queries:
+        start = time.perf_counter()
+        from_table = lookup_pillars(table, solar_date, time_jiji)
+        timings['table'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        live = _live_pillars(df, solar_date, time_jiji)
+        timings['live'].append(time.perf_counter() - start)
+
+        if from_table != live:
+            mismatches += 1
+
+    print(f"조회 {args.samples:,}회 (단위: µs)")
+    for name, samples in timings.items():
+        print(f"  {name:>5}: p50 {_percentile_us(samples, 50):10.1f}  p99 {_percentile_us(samples, 99):10.1f}  평균 {np.mean(samples) * 1e6:10.1f}")
+    print(f"  속도 향상(p50): {_percentile_us(timings['live'], 50) / _percentile_us(timings['table'], 50):.0f}배")
+    print(f"  결과 불일치: {mismatches}건")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="미리 계산된 사주 기둥 표를 만들거나 성능을 측정합니다.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="만세력 DB로부터 기둥 표 파일을 만듭니다.")
+    build_parser.add_argument('--db', default='manse_db.sqlite')
+    build_parser.add_argument('--out', default=PILLAR_TABLE_FILE)
+    build_parser.set_defaults(func=run_build)
+
+    bench_parser = subparsers.add_parser('bench', help="기둥 표 조회와 실시간 계산의 크기/속도를 비교합니다.")
+    bench_parser.add_argument('--db', default='manse_db.sqlite')
+    bench_parser.add_argument('--table', default=PILLAR_TABLE_FILE)
+    bench_parser.add_argument('--samples', type=int, default=20000)
+    bench_parser.add_argument('--seed', type=int, default=0)
+    bench_parser.set_defaults(func=run_bench)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
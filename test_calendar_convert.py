@@ -0,0 +1,105 @@
+# 파일 역할: test_calendar_convert.py
+# calendar_convert.py의 일괄 변환 API가 각 상태(status)를 올바르게 구분하는지 확인하는 테스트입니다.
+# 실제 DB 대신, 앞뒤가 잘린 달이 있는 작은 대응표를 직접 만들어 사용합니다.
+#
+# 실행: python -m pytest -q test_calendar_convert.py
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import calendar_convert as cc
+
+SOLAR_START = date(2000, 2, 9)
+
+# (음력 월, 윤달 여부, 첫 날, 마지막 날)
+# 1월은 5일부터(DB가 달 중간에서 시작), 3월은 10일까지(달 중간에서 끝)만 들어 있고, 2월 뒤에 윤2월이 있습니다.
+LUNAR_MONTHS = [(1, False, 5, 30), (2, False, 1, 29), (2, True, 1, 29), (3, False, 1, 10)]
+
+
+def _calendar_frame():
+    """_read_calendar_data()와 같은 컬럼을 가진 작은 대응표를 만듭니다."""
+    rows = []
+    solar = SOLAR_START
+    for month, is_leap, first_day, last_day in LUNAR_MONTHS:
+        for day in range(first_day, last_day + 1):
+            rows.append({
+                'solar_year': solar.year, 'solar_month': solar.month, 'solar_day': solar.day,
+                'lunar_year': 2000, 'lunar_month': month, 'lunar_day': day,
+                'is_leap': '윤' if is_leap else '평',
+            })
+            solar += timedelta(days=1)
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope='module')
+def converter():
+    return cc.build_converter(_calendar_frame())
+
+
+def _solar_date(row):
+    return date(int(row['solar_year']), int(row['solar_month']), int(row['solar_day']))
+
+
+def test_solar_to_lunar_statuses(converter):
+    result = cc.solar_to_lunar(
+        converter,
+        pd.Series([2000, 1999, 2000, 2000.7, pd.NA], dtype=object),
+        [2, 1, 2, 2, 2],
+        [9, 1, 30, 9, 9])
+    assert list(result['status']) == [cc.STATUS_OK, cc.STATUS_OUT_OF_RANGE, cc.STATUS_INVALID_DATE,
+                                      cc.STATUS_INVALID_DATE, cc.STATUS_MISSING]
+    assert result.iloc[0][['lunar_year', 'lunar_month', 'lunar_day']].tolist() == [2000, 1, 5]
+    assert not result['is_leap'].iloc[0]
+    assert result.iloc[1:][['lunar_year', 'lunar_month', 'lunar_day', 'is_leap']].isna().all().all()
+
+
+def test_solar_to_lunar_missing_values_in_nullable_and_float_input(converter):
+    years = pd.Series([2000, None], dtype='Int64')
+    assert list(cc.solar_to_lunar(converter, years, 2, 9)['status']) == [cc.STATUS_OK, cc.STATUS_MISSING]
+    floats = np.array([2000.0, np.nan])
+    assert list(cc.solar_to_lunar(converter, floats, 2, 9)['status']) == [cc.STATUS_OK, cc.STATUS_MISSING]
+
+
+def test_lunar_to_solar_strict_statuses(converter):
+    result = cc.lunar_to_solar(
+        converter,
+        [2000, 2000, 2000, 2000, 2000, 2001, 2000, None, 2000],
+        [1, 2, 1, 2, 13, 1, 3, 1, 1.5],
+        [5, 1, 5, 30, 1, 1, 20, 1, 5],
+        [False, True, True, False, False, False, False, False, False])
+    assert list(result['status']) == [
+        cc.STATUS_OK, cc.STATUS_OK, cc.STATUS_NO_LEAP_MONTH, cc.STATUS_NONEXISTENT_DAY, cc.STATUS_INVALID_DATE,
+        cc.STATUS_OUT_OF_RANGE, cc.STATUS_OUT_OF_RANGE, cc.STATUS_MISSING, cc.STATUS_INVALID_DATE]
+    assert _solar_date(result.iloc[0]) == SOLAR_START
+    # 1월(26일) + 2월(29일) 뒤가 윤2월 1일입니다.
+    assert _solar_date(result.iloc[1]) == SOLAR_START + timedelta(days=26 + 29)
+    assert result.iloc[2:][['solar_year', 'solar_month', 'solar_day']].isna().all().all()
+
+
+def test_lunar_to_solar_nearest_policy(converter):
+    result = cc.lunar_to_solar(
+        converter, 2000, [1, 2, 1], [5, 30, 2], ['윤', '평', '윤'], policy='nearest')
+    # 윤1월 → 1월 5일, 2월 30일 → 2월 29일(말일), 윤1월 2일 → 1월 2일이지만 DB가 1월 5일부터라 범위 밖입니다.
+    assert list(result['status']) == [cc.STATUS_ADJUSTED, cc.STATUS_ADJUSTED, cc.STATUS_OUT_OF_RANGE]
+    assert _solar_date(result.iloc[0]) == SOLAR_START
+    assert _solar_date(result.iloc[1]) == SOLAR_START + timedelta(days=26 + 28)
+    assert result.iloc[2][['solar_year', 'solar_month', 'solar_day']].isna().all()
+
+
+def test_round_trip(converter):
+    frame = _calendar_frame()
+    lunar = cc.solar_to_lunar(converter, frame['solar_year'], frame['solar_month'], frame['solar_day'])
+    assert (lunar['status'] == cc.STATUS_OK).all()
+    solar = cc.lunar_to_solar(converter, lunar['lunar_year'], lunar['lunar_month'], lunar['lunar_day'], lunar['is_leap'])
+    assert (solar['status'] == cc.STATUS_OK).all()
+    assert (solar[['solar_year', 'solar_month', 'solar_day']].to_numpy() == frame[['solar_year', 'solar_month', 'solar_day']].to_numpy()).all()
+
+
+def test_invalid_policy_and_empty_frame(converter):
+    with pytest.raises(ValueError):
+        cc.lunar_to_solar(converter, 2000, 1, 5, policy='closest')
+    with pytest.raises(ValueError):
+        cc.build_converter(_calendar_frame().iloc[0:0])
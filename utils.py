@@ -7,60 +7,210 @@ import streamlit as st
 import pandas as pd
 import sqlite3
 from datetime import datetime
-from datetime import datetime, timedelta, time
+from datetime import date, datetime, timedelta, time
 import os
+import threading
+import uuid
 from constants import CHEONGAN, JIJI # constants.py 파일에서 천간, 지지 리스트를 가져옵니다.
+from pillar_table import PILLAR_TABLE_FILE
+from feedback_search import FeedbackSearchIndex, feedback_id_of
 
 # --- 1. 데이터 로딩 및 전처리 ---
-# '@st.cache_data'는 Streamlit의 강력한 기능으로, 함수의 결과를 메모리에 저장(캐싱)합니다.
-# 이렇게 하면 함수가 동일한 입력으로 다시 호출될 때, 복잡한 계산을 반복하는 대신 저장된 결과를 즉시 반환하여 앱 속도를 크게 향상시킵니다.
-# 데이터베이스 파일을 읽는 것처럼 비용이 큰 작업에 매우 유용합니다.
-@st.cache_data
-def load_data(db_path='manse_db.sqlite'):
+DB_FILE = 'manse_db.sqlite'
+
+# 원본 컬럼 이름(예: 'cd_sgi')을 새로운 이름(예: 'year_seogi')으로 변경하기 위한 딕셔너리입니다.
+RENAME_DICT = {
+    'cd_sgi': 'year_seogi', 'cd_sy': 'solar_year', 'cd_sm': 'solar_month',
+    'cd_sd': 'solar_day', 'cd_ly': 'lunar_year', 'cd_lm': 'lunar_month',
+    'cd_ld': 'lunar_day', 'cd_is_yun': 'is_leap',  # 윤달 정보 컬럼
+    'cd_hyganjee': 'year_ganjee_hj', 'cd_kyganjee': 'year_ganjee_kr',
+    'cd_hmganjee': 'month_ganjee_hj', 'cd_kmganjee': 'month_ganjee_kr',
+    'cd_hdganjee': 'day_ganjee_hj', 'cd_kdganjee': 'day_ganjee_kr',
+    'holiday': 'is_holiday'
+}
+
+# 한 번에 읽어올 행 수. 전체 테이블을 나누어 읽으면서 진행률을 계산하는 데 사용합니다.
+LOAD_CHUNK_SIZE = 5000
+
+def _normalize_calendar_frame(df):
     """
-    SQLite 데이터베이스에서 만세력 데이터를 불러와 Pandas DataFrame으로 변환하고,
-    컬럼 이름을 더 이해하기 쉬운 이름으로 변경합니다.
-    데이터베이스 파일이 없거나 오류가 발생하면 None을 반환하고 에러 메시지를 표시합니다.
+    DB에서 읽은 DataFrame의 컬럼 이름을 바꾸고 날짜 컬럼을 숫자로 변환합니다.
+    전체 테이블을 읽을 때와 한 행만 조회할 때 모두 같은 형태의 결과를 얻기 위해 사용합니다.
     """
+    # DataFrame의 컬럼 이름을 변경합니다. 'inplace=True'는 원본 DataFrame을 직접 수정하라는 의미입니다.
+    df.rename(columns=RENAME_DICT, inplace=True)
+
+    # 'is_leap' 컬럼이 없는 구버전 DB 파일을 대비한 예외 처리입니다.
+    # 만약 'is_leap' 컬럼이 없다면, 모든 값을 '평'으로 채운 새로운 컬럼을 만듭니다.
+    if 'is_leap' not in df.columns:
+        df['is_leap'] = '평'
+
+    # 날짜 관련 컬럼들의 데이터 타입을 문자열에서 숫자(정수)로 변환합니다.
+    # 'errors='coerce'' 옵션은 변환 중 오류가 발생하면 해당 값을 NaN으로 처리합니다.
+    for col in ['solar_year', 'solar_month', 'solar_day', 'lunar_year', 'lunar_month', 'lunar_day']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+def _read_calendar_data(db_path=DB_FILE, progress_callback=None):
+    """
+    'calenda_data' 테이블 전체를 읽어 DataFrame으로 반환합니다.
+    Streamlit 화면 요소를 사용하지 않으므로 백그라운드 스레드에서도 호출할 수 있습니다.
+    progress_callback이 주어지면 읽은 비율(0.0~1.0)을 인자로 호출합니다.
+    """
+    # 파일이 없을 때 sqlite3.connect가 빈 DB를 새로 만들지 않도록 먼저 확인합니다.
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(db_path)
+    conn = sqlite3.connect(db_path)
     try:
-        # 데이터베이스에 연결합니다.
-        conn = sqlite3.connect(db_path)
-        # SQL 쿼리를 실행하여 'calenda_data' 테이블의 모든 데이터를 가져옵니다.
-        query = "SELECT * FROM calenda_data"
-        df = pd.read_sql_query(query, conn)
-        # 데이터베이스 연결을 닫습니다.
+        total = conn.execute("SELECT COUNT(*) FROM calenda_data").fetchone()[0]
+        chunks = []
+        loaded = 0
+        for chunk in pd.read_sql_query("SELECT * FROM calenda_data", conn, chunksize=LOAD_CHUNK_SIZE):
+            chunks.append(chunk)
+            loaded += len(chunk)
+            if progress_callback and total:
+                progress_callback(min(loaded / total, 1.0))
+    finally:
         conn.close()
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=list(RENAME_DICT))
+    return _normalize_calendar_frame(df)
 
-        # 원본 컬럼 이름(예: 'cd_sgi')을 새로운 이름(예: 'year_seogi')으로 변경하기 위한 딕셔너리입니다.
-        rename_dict = {
-            'cd_sgi': 'year_seogi', 'cd_sy': 'solar_year', 'cd_sm': 'solar_month',
-            'cd_sd': 'solar_day', 'cd_ly': 'lunar_year', 'cd_lm': 'lunar_month',
-            'cd_ld': 'lunar_day', 'cd_is_yun': 'is_leap',  # 윤달 정보 컬럼
-            'cd_hyganjee': 'year_ganjee_hj', 'cd_kyganjee': 'year_ganjee_kr',
-            'cd_hmganjee': 'month_ganjee_hj', 'cd_kmganjee': 'month_ganjee_kr',
-            'cd_hdganjee': 'day_ganjee_hj', 'cd_kdganjee': 'day_ganjee_kr',
-            'holiday': 'is_holiday'
+def show_data_load_error(error):
+    """데이터베이스 로딩 실패 시 사용자에게 보여줄 안내 메시지를 표시합니다."""
+    st.error(f"데이터베이스 파일을 불러오는 데 실패했습니다: {error}")
+    st.info("'manse_app.py'와 'manse_db.sqlite' 파일이 같은 폴더에 있는지 확인해주세요.")
+
+def ensure_calendar_indexes(db_path=DB_FILE):
+    """
+    양력/음력 날짜로 한 행을 바로 찾을 수 있도록 'calenda_data' 테이블에 인덱스를 만듭니다.
+    날짜 컬럼에는 '08'처럼 문자열로 저장된 값도 있으므로, query_calendar_row와 같은 정수 변환식(CAST)에 인덱스를 겁니다.
+    이미 있으면 아무 일도 하지 않으며, 읽기 전용 DB처럼 인덱스를 만들 수 없는 경우에는 조용히 넘어갑니다.
+    """
+    if not os.path.exists(db_path):
+        return
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            # 예전 버전이 만든, 컬럼 값을 그대로 쓰는 인덱스는 더 이상 조회에 쓰이지 않으므로 지웁니다.
+            conn.execute("DROP INDEX IF EXISTS idx_calenda_solar")
+            conn.execute("DROP INDEX IF EXISTS idx_calenda_lunar")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_calenda_solar_num ON calenda_data "
+                         "(CAST(cd_sy AS INTEGER), CAST(cd_sm AS INTEGER), CAST(cd_sd AS INTEGER))")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_calenda_lunar_num ON calenda_data "
+                         "(CAST(cd_ly AS INTEGER), CAST(cd_lm AS INTEGER), CAST(cd_ld AS INTEGER))")
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass
+
+# '@st.cache_resource'는 서버 프로세스 전체에서 하나의 객체를 공유합니다.
+# 따라서 백그라운드 로딩 스레드는 서버가 처음 실행될 때 한 번만 시작되고, 모든 사용자 세션이 같은 결과를 사용합니다.
+@st.cache_resource
+def start_calendar_warmup(db_path=DB_FILE):
+    """
+    만세력 데이터 전체를 백그라운드 스레드에서 불러오기 시작하고, 진행 상태를 담은 딕셔너리를 즉시 반환합니다.
+    - 'df': 로딩이 끝나면 DataFrame, 그 전에는 None
+    - 'progress': 0.0~1.0 사이의 진행률
+    - 'error': 로딩 중 발생한 예외 (없으면 None)
+    - 'ready': 로딩이 끝나면(성공/실패 무관) set 되는 threading.Event
+    """
+    state = {'df': None, 'progress': 0.0, 'error': None, 'ready': threading.Event()}
+
+    def _update_progress(value):
+        state['progress'] = value
+
+    def _warmup():
+        try:
+            # 로딩 중 들어오는 조회는 SQLite를 직접 사용하므로, 인덱스를 먼저 만들어 둡니다.
+            ensure_calendar_indexes(db_path)
+            state['df'] = _read_calendar_data(db_path, progress_callback=_update_progress)
+        except Exception as e:
+            state['error'] = e
+        finally:
+            state['ready'].set()
+
+    threading.Thread(target=_warmup, name="calendar-warmup", daemon=True).start()
+    return state
+
+# DB 파일 경로별로 'calenda_data' 테이블에 'cd_is_yun' 컬럼이 있는지 기억해 둡니다. (테이블 구조는 실행 중에 바뀌지 않습니다.)
+_leap_column_cache = {}
+
+def _calendar_has_leap_column(conn, db_path):
+    """'calenda_data' 테이블에 윤달 정보 컬럼('cd_is_yun')이 있는지 확인합니다. 경로마다 한 번만 조회합니다."""
+    if db_path not in _leap_column_cache:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(calenda_data)")}
+        _leap_column_cache[db_path] = 'cd_is_yun' in columns
+    return _leap_column_cache[db_path]
+
+def query_calendar_row(cal_type, year, month, day, db_path=DB_FILE):
+    """
+    메모리 데이터가 준비되기 전에 사용하는 빠른 조회 경로입니다.
+    인덱스가 걸린 날짜 컬럼으로 SQLite에서 한 행만 읽어, _read_calendar_data()의 DataFrame 행과 같은 형태(Series)로 반환합니다.
+    해당 날짜가 없으면 None을 반환합니다.
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        # _normalize_calendar_frame과 같은 규칙을 따릅니다.
+        # 날짜 컬럼은 문자열('08' 등)일 수 있으므로 pd.to_numeric처럼 정수로 바꾸어 비교합니다. (ensure_calendar_indexes의 인덱스와 같은 식)
+        # 'cd_is_yun' 컬럼이 없는 구버전 DB는 모든 날을 평달로 보고, 값이 비어 있는(NULL) 날도 평달로 봅니다.
+        if _calendar_has_leap_column(conn, db_path):
+            regular_condition, leap_condition = "IFNULL(cd_is_yun, '평') != '윤'", "cd_is_yun = '윤'"
+        else:
+            regular_condition, leap_condition = "1", "0"
+        solar_condition = "CAST(cd_sy AS INTEGER) = ? AND CAST(cd_sm AS INTEGER) = ? AND CAST(cd_sd AS INTEGER) = ?"
+        lunar_condition = "CAST(cd_ly AS INTEGER) = ? AND CAST(cd_lm AS INTEGER) = ? AND CAST(cd_ld AS INTEGER) = ?"
+        query_map = {
+            "양력": f"SELECT * FROM calenda_data WHERE {solar_condition} LIMIT 1",
+            "음력(평달)": f"SELECT * FROM calenda_data WHERE {lunar_condition} AND {regular_condition} LIMIT 1",
+            "음력(윤달)": f"SELECT * FROM calenda_data WHERE {lunar_condition} AND {leap_condition} LIMIT 1",
         }
-        # DataFrame의 컬럼 이름을 변경합니다. 'inplace=True'는 원본 DataFrame을 직접 수정하라는 의미입니다.
-        df.rename(columns=rename_dict, inplace=True)
-        
-        # 'is_leap' 컬럼이 없는 구버전 DB 파일을 대비한 예외 처리입니다.
-        # 만약 'is_leap' 컬럼이 없다면, 모든 값을 '평'으로 채운 새로운 컬럼을 만듭니다.
-        if 'is_leap' not in df.columns:
-            df['is_leap'] = '평'
-
-        # 날짜 관련 컬럼들의 데이터 타입을 문자열에서 숫자(정수)로 변환합니다.
-        # 'errors='coerce'' 옵션은 변환 중 오류가 발생하면 해당 값을 NaT(Not a Time)으로 처리합니다.
-        for col in ['solar_year', 'solar_month', 'solar_day', 'lunar_year', 'lunar_month', 'lunar_day']:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        # 처리된 DataFrame을 반환합니다.
-        return df
+        row_df = pd.read_sql_query(query_map[cal_type], conn, params=(year, month, day))
+    finally:
+        conn.close()
+    if row_df.empty:
+        return None
+    return _normalize_calendar_frame(row_df).iloc[0]
+
+def find_calendar_row(df, cal_type, year, month, day, db_path=DB_FILE):
+    """
+    달력 종류(양력/음력 평달/음력 윤달)와 날짜로 만세력 데이터 한 행을 찾습니다.
+    df가 None이면(백그라운드 로딩 중) SQLite에서 직접 조회합니다. 해당 날짜가 없으면 None을 반환합니다.
+    """
+    if df is None:
+        return query_calendar_row(cal_type, year, month, day, db_path)
+
+    query_map = {
+        "양력": (df['solar_year'] == year) & (df['solar_month'] == month) & (df['solar_day'] == day),
+        "음력(평달)": (df['lunar_year'] == year) & (df['lunar_month'] == month) & (df['lunar_day'] == day) & (df['is_leap'] != '윤'),
+        "음력(윤달)": (df['lunar_year'] == year) & (df['lunar_month'] == month) & (df['lunar_day'] == day) & (df['is_leap'] == '윤')
+    }
+    result_row = df[query_map[cal_type]]
+    if result_row.empty:
+        return None
+    return result_row.iloc[0]
+
+# 미리 계산된 사주 기둥 표 파일은 'python pillar_table.py build'로 생성합니다. 파일이 없으면 표 없이 계산합니다.
+@st.cache_resource
+def load_pillar_table(path=PILLAR_TABLE_FILE, db_path=DB_FILE):
+    """
+    미리 계산된 사주 기둥 표를 불러옵니다. 표는 선택 사항이므로 파일이 없거나 읽을 수 없으면 None을 반환합니다.
+    표에 저장된 원본 DB 해시가 현재 db_path의 내용과 다르면(예전 DB로 만든 표) 사용하지 않고 None을 반환합니다.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        from pillar_table import load_table, source_fingerprint
+        table = load_table(path)
+        if table['source'] is None or table['source'] != source_fingerprint(db_path):
+            st.warning("사주 기둥 표가 현재 데이터베이스와 맞지 않아 실시간 계산을 사용합니다. "
+                       "'python pillar_table.py build'로 표를 다시 만들어 주세요.")
+            return None
+        return table
     except Exception as e:
-        # 데이터 로딩 중 어떤 종류의 오류든 발생하면, 사용자에게 에러 메시지를 보여줍니다.
-        st.error(f"데이터베이스 파일을 불러오는 데 실패했습니다: {e}")
-        st.info("'manse_app.py'와 'manse_db.sqlite' 파일이 같은 폴더에 있는지 확인해주세요.")
-        # 실패 시 None을 반환하여 메인 앱에서 데이터가 없음을 알 수 있게 합니다.
+        st.warning(f"사주 기둥 표를 불러오지 못해 실시간 계산을 사용합니다: {e}")
         return None
 
 # --- 2. 핵심 기능 함수 ---
@@ -133,8 +283,12 @@ def validate_date(date_str):
         # 변환 실패 시 (예: "20230230"처럼 없는 날짜) 에러 메시지 반환
         return None, "입력하신 날짜가 유효하지 않습니다. 다시 확인해주세요."
 
-def calculate_manse_info(df, birth_date_str, time_input_method, birth_time_str_direct, birth_time_option, cal_type, birth_region, blood_type_base, is_rh_minus):
-    """사용자 입력을 바탕으로 만세력 정보를 계산하고 결과 딕셔너리 또는 오류 메시지를 반환합니다."""
+def calculate_manse_info(df, birth_date_str, time_input_method, birth_time_str_direct, birth_time_option, cal_type, birth_region, blood_type_base, is_rh_minus, db_path=DB_FILE, pillar_table=None):
+    """
+    사용자 입력을 바탕으로 만세력 정보를 계산하고 결과 딕셔너리 또는 오류 메시지를 반환합니다.
+    df가 None이면(데이터 로딩 중) db_path의 SQLite 파일에서 해당 날짜 한 행만 직접 조회합니다.
+    pillar_table(load_pillar_table()의 결과)이 주어지면 네 기둥을 미리 계산된 표에서 읽어옵니다.
+    """
     from constants import BIRTH_REGIONS, JIJI_TO_ZODIAC
 
     date_obj, error_msg = validate_date(birth_date_str)
@@ -176,35 +330,52 @@ def calculate_manse_info(df, birth_date_str, time_input_method, birth_time_str_d
             true_solar_dt = base_dt + timedelta(minutes=region_offset)
 
     lookup_date = date_obj
-    lookup_year, lookup_month, lookup_day = lookup_date.year, lookup_date.month, lookup_date.day
-    query_map = {
-        "양력": (df['solar_year'] == lookup_year) & (df['solar_month'] == lookup_month) & (df['solar_day'] == lookup_day),
-        "음력(평달)": (df['lunar_year'] == lookup_year) & (df['lunar_month'] == lookup_month) & (df['lunar_day'] == lookup_day) & (df['is_leap'] != '윤'),
-        "음력(윤달)": (df['lunar_year'] == lookup_year) & (df['lunar_month'] == lookup_month) & (df['lunar_day'] == lookup_day) & (df['is_leap'] == '윤')
-    }
-    result_row = df[query_map[cal_type]]
+    not_found_msg = "데이터베이스에서 해당 날짜 정보를 찾을 수 없습니다. (지원 범위: 1900년 ~ 2050년)"
+    table_time_jiji = get_time_jiji_from_datetime(true_solar_dt) if is_time_entered and true_solar_dt is not None else None
 
-    if result_row.empty:
-        return None, "데이터베이스에서 해당 날짜 정보를 찾을 수 없습니다. (지원 범위: 1900년 ~ 2050년)"
-
-    result = result_row.iloc[0]
-    korean_age = datetime.now().year - result['solar_year'] + 1
-    pillars = {
-        "연주(年柱)": result['year_ganjee_hj'],
-        "월주(月柱)": result['month_ganjee_hj'],
-        "일주(日柱)": result['day_ganjee_hj'],
-    }
+    # 기둥 표가 있으면 양력 날짜는 DB 행을 찾지 않고 표 조회만으로 끝납니다.
+    pillars = None
+    if pillar_table is not None and cal_type == "양력":
+        from pillar_table import lookup_pillars
+
+        pillars = lookup_pillars(pillar_table, lookup_date.date(), table_time_jiji)
+        korean_age = datetime.now().year - lookup_date.year + 1
+
+    # 음력 날짜이거나, 표가 없거나, 표에 없는 날짜이면 DB 행을 찾습니다.
+    if pillars is None:
+        try:
+            result = find_calendar_row(df, cal_type, lookup_date.year, lookup_date.month, lookup_date.day, db_path)
+        except Exception as e:
+            return None, f"데이터베이스 조회 중 오류가 발생했습니다: {e}"
+
+        if result is None:
+            return None, not_found_msg
+        korean_age = datetime.now().year - result['solar_year'] + 1
 
-    if is_time_entered and true_solar_dt is not None:
-        # 자시(23:30-01:29)는 날짜가 바뀔 수 있으므로, 시주 계산 시 실제 태어난 날의 일주를 사용해야 함
-        day_ganjee_to_use = result['day_ganjee_hj']
-        # 23:30 이후 출생 시, 일주 간지는 다음날의 것을 사용해야 할 수 있으나, 만세력의 복잡한 규칙(절기 기준)이 있어 여기서는 조회된 날의 일주를 그대로 사용합니다.
-        # (정확도를 더 높이려면 야자시/조자시 구분이 필요)
-        time_jiji = get_time_jiji_from_datetime(true_solar_dt)
-        if time_jiji:
-            time_cheon = get_time_cheongan(day_ganjee_to_use, time_jiji)
-            if time_cheon:
-                pillars["시주(時柱)"] = time_cheon + time_jiji
+        if pillar_table is not None and cal_type != "양력":
+            from pillar_table import lookup_pillars
+
+            # 음력 날짜는 DB 행에서 알아낸 양력 날짜로 표를 조회합니다.
+            solar_date = date(int(result['solar_year']), int(result['solar_month']), int(result['solar_day']))
+            pillars = lookup_pillars(pillar_table, solar_date, table_time_jiji)
+
+    if pillars is None:
+        pillars = {
+            "연주(年柱)": result['year_ganjee_hj'],
+            "월주(月柱)": result['month_ganjee_hj'],
+            "일주(日柱)": result['day_ganjee_hj'],
+        }
+
+        if is_time_entered and true_solar_dt is not None:
+            # 자시(23:30-01:29)는 날짜가 바뀔 수 있으므로, 시주 계산 시 실제 태어난 날의 일주를 사용해야 함
+            day_ganjee_to_use = result['day_ganjee_hj']
+            # 23:30 이후 출생 시, 일주 간지는 다음날의 것을 사용해야 할 수 있으나, 만세력의 복잡한 규칙(절기 기준)이 있어 여기서는 조회된 날의 일주를 그대로 사용합니다.
+            # (정확도를 더 높이려면 야자시/조자시 구분이 필요)
+            time_jiji = get_time_jiji_from_datetime(true_solar_dt)
+            if time_jiji:
+                time_cheon = get_time_cheongan(day_ganjee_to_use, time_jiji)
+                if time_cheon:
+                    pillars["시주(時柱)"] = time_cheon + time_jiji
 
     blood_type = ""
     if blood_type_base != "선택 안함":
@@ -223,57 +394,221 @@ def calculate_manse_info(df, birth_date_str, time_input_method, birth_time_str_d
 
 # --- 3. 설정 파일 처리 ---
 
+import copy
 import json
+import stat
+import tempfile
+from contextlib import contextmanager
+from functools import lru_cache
+from string import Template
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SETTINGS_FILE = 'settings.json'
+# 프로필을 따로 고르지 않았을 때 사용하는 기본 프로필 이름입니다.
+DEFAULT_PROFILE_NAME = '기본'
+
+# 설정 파일은 여러 사용자 세션(스레드)이 함께 쓰므로, '읽고-고치고-쓰는' 과정 전체를 이 잠금(다른 프로세스와는 _file_lock)으로 묶습니다.
+_settings_lock = threading.RLock()
+# 파일 경로별로 마지막으로 읽은 내용을 기억합니다. {경로: ((수정 시각, 파일 크기), 설정 저장소)}
+_settings_cache = {}
+
+# settings.json 구조:
+# {
+#     "profiles": {
+#         "기본": {"p_b_top": 32.0, ..., "f_a_size": 14.0},
+#         "병원 접수증": {...}
+#     }
+# }
+# 예전 버전처럼 위치/크기 값만 들어 있는 파일은 '기본' 프로필 하나로 읽습니다.
+
+def _settings_file_key(path):
+    """파일이 바뀌었는지 판단하기 위한 (수정 시각, 크기) 값을 반환합니다. 파일이 없으면 None을 반환합니다."""
+    try:
+        st_result = os.stat(path)
+    except OSError:
+        return None
+    return (st_result.st_mtime_ns, st_result.st_size)
 
-def save_settings(settings, path='settings.json'):
+def _normalize_settings_store(raw, default_settings):
+    """파일에서 읽은 내용을 {'profiles': {...}} 형태로 맞추고, 빠진 값은 기본값으로 채웁니다."""
+    if isinstance(raw, dict) and isinstance(raw.get('profiles'), dict):
+        profiles = raw['profiles']
+    else:
+        profiles = {DEFAULT_PROFILE_NAME: raw if isinstance(raw, dict) else {}}
+    if DEFAULT_PROFILE_NAME not in profiles:
+        profiles[DEFAULT_PROFILE_NAME] = {}
+    return {'profiles': {name: {**default_settings, **values} for name, values in profiles.items()}}
+
+def _write_json_atomic(data, path):
     """
-    인쇄 설정값(딕셔너리)을 JSON 파일로 저장합니다.
+    같은 폴더의 임시 파일에 먼저 쓴 뒤 이름을 바꿔(os.replace) 한 번에 교체합니다.
+    이렇게 하면 다른 세션이 쓰는 도중의 반쯤 쓰인 파일을 읽는 일이 없습니다.
     """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}-', suffix='.tmp', dir=directory)
     try:
-        # 파일을 쓰기 모드('w')로 열고, UTF-8 인코딩을 사용합니다.
-        # 'indent=4'는 JSON 파일을 사람이 보기 좋게 4칸 들여쓰기로 저장하라는 옵션입니다.
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, indent=4)
-    except Exception as e:
-        # 파일 저장 중 오류 발생 시, 사용자에게 알려줍니다.
-        st.error(f"설정을 저장하는 데 실패했습니다: {e}")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp는 파일을 0600 권한으로 만들므로, 기존 파일의 권한(없으면 0644)을 옮겨 준 뒤 교체합니다.
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+@contextmanager
+def _file_lock(path):
+    """
+    '<path>.lock' 파일에 운영체제 잠금을 걸어, 같은 폴더를 쓰는 다른 프로세스와도 '읽고-고치고-쓰는' 순서를 지킵니다.
+    스레드 잠금(_settings_lock, _feedback_lock)은 한 프로세스 안에서만 유효하므로 함께 사용합니다.
+    """
+    with open(path + '.lock', 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _read_settings_store(default_settings, path):
+    """
+    설정 저장소를 읽습니다. 파일의 수정 시각과 크기가 지난번과 같으면 파일을 다시 읽지 않고 기억해 둔 내용을 사용합니다.
+    파일이 있지만 읽거나 해석할 수 없으면 예외를 그대로 올려 보냅니다. (호출한 쪽이 기본값으로 덮어쓰지 않도록 하기 위함입니다.)
+    반드시 _settings_lock을 잡은 상태에서 호출해야 하며, 반환값은 캐시와 공유되므로 수정하면 안 됩니다.
+    """
+    file_key = _settings_file_key(path)
+    cached = _settings_cache.get(path)
+    if cached is not None and cached[0] == file_key:
+        return cached[1]
+
+    if file_key is None:
+        store = _normalize_settings_store({}, default_settings)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            store = _normalize_settings_store(json.load(f), default_settings)
+
+    _settings_cache[path] = (file_key, store)
+    # 각 프로필의 인쇄용 HTML 틀을 미리 만들어 두어, 인쇄할 때는 값만 채워 넣으면 되도록 합니다.
+    for profile_settings in store['profiles'].values():
+        compile_print_template(*print_layout_from_settings(profile_settings))
+    return store
 
-def load_settings(default_settings, path='settings.json'):
+def load_settings_store(default_settings, path=SETTINGS_FILE):
     """
-    JSON 파일에서 인쇄 설정값을 불러옵니다. 파일이 없으면 기본 설정값을 반환합니다.
+    모든 인쇄 양식 프로필을 담은 설정 저장소를 불러옵니다.
+    파일의 수정 시각과 크기가 지난번과 같으면 파일을 다시 읽지 않고 기억해 둔 내용을 돌려줍니다.
+    반환값은 복사본이므로 호출한 쪽에서 자유롭게 수정해도 됩니다.
     """
-    # 설정 파일이 존재하는지 확인합니다.
-    if os.path.exists(path):
+    with _settings_lock:
         try:
-            # 파일을 읽기 모드('r')로 엽니다.
-            with open(path, 'r', encoding='utf-8') as f:
-                # JSON 파일의 내용을 읽어 파이썬 딕셔너리로 변환하여 반환합니다.
-                return json.load(f)
+            return copy.deepcopy(_read_settings_store(default_settings, path))
         except Exception as e:
-            # 파일 읽기 중 오류 발생 시, 사용자에게 알리고 기본값을 사용합니다.
+            # 파일 읽기 중 오류 발생 시, 사용자에게 알리고 기본값을 사용합니다. (다음 실행 때 다시 읽기를 시도합니다.)
             st.error(f"설정 파일을 불러오는 데 실패했습니다: {e}")
-            return default_settings
-    else:
-        # 파일이 존재하지 않으면, 미리 정의된 기본 설정값을 반환합니다.
-        return default_settings
+            return _normalize_settings_store({}, default_settings)
+
+def _update_settings_store(update_fn, default_settings, path):
+    """
+    잠금을 잡은 상태에서 저장소를 읽고, update_fn으로 고친 뒤, 원자적으로 저장합니다.
+    기존 파일을 해석할 수 없으면 예외를 올려 보내고 파일은 그대로 둡니다. (다른 프로필이 지워지지 않도록)
+    """
+    with _settings_lock, _file_lock(path):
+        store = copy.deepcopy(_read_settings_store(default_settings, path))
+        update_fn(store)
+        _write_json_atomic(store, path)
+        _settings_cache[path] = (_settings_file_key(path), store)
+
+def list_profiles(default_settings, path=SETTINGS_FILE):
+    """저장된 프로필 이름 목록을 반환합니다. 기본 프로필이 항상 맨 앞에 옵니다."""
+    names = load_settings_store(default_settings, path)['profiles'].keys()
+    return [DEFAULT_PROFILE_NAME] + sorted(name for name in names if name != DEFAULT_PROFILE_NAME)
+
+def save_settings(settings, path=SETTINGS_FILE, profile=DEFAULT_PROFILE_NAME, default_settings=None):
+    """
+    인쇄 설정값(딕셔너리)을 지정한 프로필 이름으로 JSON 파일에 저장합니다.
+    성공하면 True, 실패하면 에러 메시지를 표시하고 False를 반환합니다.
+    """
+    def _apply(store):
+        store['profiles'][profile] = dict(settings)
+
+    try:
+        _update_settings_store(_apply, default_settings or settings, path)
+        return True
+    except Exception as e:
+        # 파일 저장 중 오류 발생 시, 사용자에게 알려줍니다.
+        st.error(f"설정을 저장하는 데 실패했습니다: {e}")
+        return False
+
+def delete_profile(profile, default_settings, path=SETTINGS_FILE):
+    """프로필을 삭제합니다. 기본 프로필은 삭제할 수 없습니다. 삭제했으면 True를 반환합니다."""
+    if profile == DEFAULT_PROFILE_NAME:
+        return False
+
+    def _apply(store):
+        store['profiles'].pop(profile, None)
+
+    try:
+        _update_settings_store(_apply, default_settings, path)
+        return True
+    except Exception as e:
+        st.error(f"프로필을 삭제하는 데 실패했습니다: {e}")
+        return False
+
+def load_settings(default_settings, path=SETTINGS_FILE, profile=DEFAULT_PROFILE_NAME):
+    """
+    지정한 프로필의 인쇄 설정값을 불러옵니다. 파일이나 프로필이 없으면 기본 설정값을 반환합니다.
+    """
+    profiles = load_settings_store(default_settings, path)['profiles']
+    return profiles.get(profile, dict(default_settings))
 
 # --- 4. 인쇄용 HTML 생성 ---
 
-def generate_print_html(data, positions, font_sizes):
+def print_layout_from_settings(settings):
     """
-    만세력 결과 데이터와 위치/크기 설정값을 바탕으로 인쇄용 HTML 문서를 동적으로 생성합니다.
+    설정값(p_* 위치, f_* 글자 크기)을 generate_print_html이 사용하는 (positions, font_sizes) 형태로 바꿉니다.
     """
-    # 전달받은 데이터들을 각 변수에 할당하여 코드 가독성을 높입니다.
-    birth_date = data.get('birth_date', '')
-    cal_type_char = '(+)' if data.get('cal_type') == '양력' else '(-)'
-    age = data.get('age', '')
-    
-    pillars = data.get('pillars', {})
-    
-    # 월주가 있으면 두 번째 글자(지지)만 사용하고, 없으면 빈 문자열로 처리합니다.
-    month_jiji = pillars.get('월주(月柱)', '  ')[1] if '월주(月柱)' in pillars else ''
-    
-    blood_type = data.get('blood_type', '')
+    positions = {
+        "birth_date_top": settings['p_b_top'], "birth_date_left": settings['p_b_left'],
+        "manse_grid_top": settings['p_s_top'], "manse_grid_left": settings['p_s_left'],
+        "age_info_top": settings['p_a_top'], "age_info_left": settings['p_a_left']
+    }
+    font_sizes = {
+        "birth_date_fs": settings['f_b_size'],
+        "manse_grid_fs": settings['f_s_size'],
+        "age_info_fs": settings['f_a_size']
+    }
+    return positions, font_sizes
+
+def compile_print_template(positions, font_sizes):
+    """
+    위치/크기 설정값으로 인쇄용 HTML의 '틀'을 만듭니다. 조회 결과가 들어갈 자리는 $이름 형태로 비워 둡니다.
+    같은 설정값에 대해서는 한 번 만든 틀을 다시 사용합니다.
+    """
+    return _compile_print_template(tuple(sorted(positions.items())), tuple(sorted(font_sizes.items())))
+
+@lru_cache(maxsize=64)
+def _compile_print_template(position_items, font_size_items):
+    positions = dict(position_items)
+    font_sizes = dict(font_size_items)
 
     # --- HTML 구조 생성 ---
     # 절대 위치(absolute positioning)를 사용하여 각 정보 블록을 A4 용지 위의 특정 좌표에 배치합니다.
@@ -282,45 +617,27 @@ def generate_print_html(data, positions, font_sizes):
     # 1. 생년월일 정보 HTML
     birth_date_html = f"""
     <div style="position: absolute; top: {positions['birth_date_top']}mm; left: {positions['birth_date_left']}mm; font-size: {font_sizes['birth_date_fs']}pt; letter-spacing: 1px;">
-        {birth_date}{cal_type_char}
+        $birth_date_text
     </div>
     """
     
-    # 2. 만세력 정보 HTML
-    # 표시할 만세력 기둥들을 순서대로 정렬합니다. 시주가 없으면 3개만 표시됩니다.
-    display_order = ["시주(時柱)", "일주(日柱)", "월주(月柱)", "연주(年柱)"]
-    pillars_to_display = {title: pillars[title] for title in display_order if title in pillars}
-    
-    # 만세력 8글자를 윗줄(천간)과 아랫줄(지지)로 분리합니다.
-    top_row_chars = [ganjee[0] for ganjee in pillars_to_display.values()]
-    bottom_row_chars = [ganjee[1] for ganjee in pillars_to_display.values()]
-    
-    # 각 줄의 글자들을 HTML div 태그로 감싸줍니다. padding 값을 0.1em으로 설정하여 간격을 좁힙니다.
-    top_row_html = "".join([f"<div style='padding: 0 0.1em;'>{char}</div>" for char in top_row_chars])
-    bottom_row_html = "".join([f"<div style='padding: 0 0.1em;'>{char}</div>" for char in bottom_row_chars])
-
+    # 2. 만세력 정보 HTML (윗줄: 천간, 아랫줄: 지지)
     manse_grid_html = f"""
     <div style="position: absolute; top: {positions['manse_grid_top']}mm; left: {positions['manse_grid_left']}mm; font-size: {font_sizes['manse_grid_fs']}pt; font-family: 'Malgun Gothic', sans-serif; text-align: center; line-height: 1.2;">
-        <div style="display: flex; justify-content: center;">{top_row_html}</div>
-        <div style="display: flex; justify-content: center;">{bottom_row_html}</div>
+        <div style="display: flex; justify-content: center;">$top_row_html</div>
+        <div style="display: flex; justify-content: center;">$bottom_row_html</div>
     </div>
     """
     
     # 3. 나이, 월주 지지, 혈액형 정보 HTML
-    # 혈액형 정보가 있을 때만 ' - 혈액형' 부분을 추가합니다.
-    age_info_parts = [f"{age}세", month_jiji]
-    if blood_type:
-        age_info_parts.append(blood_type)
-    age_info_text = " - ".join(filter(None, age_info_parts)) # 빈 항목은 제외하고 ' - '로 연결
-
     age_info_html = f"""
     <div style="position: absolute; top: {positions['age_info_top']}mm; left: {positions['age_info_left']}mm; font-size: {font_sizes['age_info_fs']}pt;">
-        {age_info_text}
+        $age_info_text
     </div>
     """
 
     # --- 전체 HTML 문서 조합 ---
-    # 생성된 각 정보 블록 HTML을 기본 HTML 양식에 삽입하여 최종 문서를 완성합니다.
+    # 생성된 각 정보 블록 HTML을 기본 HTML 양식에 삽입하여 최종 문서의 틀을 완성합니다.
     full_html = f"""
     <!DOCTYPE html>
     <html>
@@ -349,28 +666,98 @@ def generate_print_html(data, positions, font_sizes):
     </body>
     </html>
     """
-    return full_html
+    return Template(full_html)
+
+def generate_print_html(data, positions, font_sizes):
+    """
+    만세력 결과 데이터와 위치/크기 설정값을 바탕으로 인쇄용 HTML 문서를 동적으로 생성합니다.
+    HTML 틀은 compile_print_template이 미리 만들어 둔 것을 사용하고, 여기서는 결과 값만 채워 넣습니다.
+    """
+    # 전달받은 데이터들을 각 변수에 할당하여 코드 가독성을 높입니다.
+    birth_date = data.get('birth_date', '')
+    cal_type_char = '(+)' if data.get('cal_type') == '양력' else '(-)'
+    age = data.get('age', '')
+    
+    pillars = data.get('pillars', {})
+    
+    # 월주가 있으면 두 번째 글자(지지)만 사용하고, 없으면 빈 문자열로 처리합니다.
+    month_jiji = pillars.get('월주(月柱)', '  ')[1] if '월주(月柱)' in pillars else ''
+    
+    blood_type = data.get('blood_type', '')
+
+    # 표시할 만세력 기둥들을 순서대로 정렬합니다. 시주가 없으면 3개만 표시됩니다.
+    display_order = ["시주(時柱)", "일주(日柱)", "월주(月柱)", "연주(年柱)"]
+    pillars_to_display = {title: pillars[title] for title in display_order if title in pillars}
+    
+    # 만세력 8글자를 윗줄(천간)과 아랫줄(지지)로 분리합니다.
+    top_row_chars = [ganjee[0] for ganjee in pillars_to_display.values()]
+    bottom_row_chars = [ganjee[1] for ganjee in pillars_to_display.values()]
+    
+    # 각 줄의 글자들을 HTML div 태그로 감싸줍니다. padding 값을 0.1em으로 설정하여 간격을 좁힙니다.
+    top_row_html = "".join([f"<div style='padding: 0 0.1em;'>{char}</div>" for char in top_row_chars])
+    bottom_row_html = "".join([f"<div style='padding: 0 0.1em;'>{char}</div>" for char in bottom_row_chars])
+
+    # 혈액형 정보가 있을 때만 ' - 혈액형' 부분을 추가합니다.
+    age_info_parts = [f"{age}세", month_jiji]
+    if blood_type:
+        age_info_parts.append(blood_type)
+    age_info_text = " - ".join(filter(None, age_info_parts)) # 빈 항목은 제외하고 ' - '로 연결
+
+    template = compile_print_template(positions, font_sizes)
+    return template.substitute(
+        birth_date_text=f"{birth_date}{cal_type_char}",
+        top_row_html=top_row_html,
+        bottom_row_html=bottom_row_html,
+        age_info_text=age_info_text,
+    )
 
 # --- 5. 피드백 저장 및 불러오기 함수 ---
 FEEDBACK_FILE = 'feedback.json'
 
+# 피드백 파일과 검색 색인은 여러 사용자 세션(스레드)이 함께 고치므로,
+# '파일 읽기 → 항목 추가/수정 → 파일 쓰기 → 색인 반영' 전체를 이 잠금(다른 프로세스와는 _file_lock)으로 묶어 한 세션씩 처리합니다.
+# 이렇게 해야 동시에 저장할 때 한쪽 피드백이 파일에서 사라지거나, 색인에만 남는 일이 없습니다.
+_feedback_lock = threading.RLock()
+
+def _feedback_mtime():
+    """피드백 파일의 수정 시각을 반환합니다. 파일이 없으면 None을 반환합니다."""
+    try:
+        return os.path.getmtime(FEEDBACK_FILE)
+    except OSError:
+        return None
+
+def _write_feedback(all_feedback, index):
+    """
+    피드백 목록 전체를 파일에 쓰고, 쓰기 전에 검색 색인(index)이 파일과 일치했는지 여부를 반환합니다.
+    일치했다면 호출한 쪽에서 바뀐 항목만 색인에 반영하면 되고, 아니라면 다음 검색 때 색인이 다시 만들어집니다.
+    반드시 _feedback_lock을 잡은 상태에서 호출해야 합니다.
+    """
+    index_was_current = index.source_mtime == _feedback_mtime()
+    # 잠금 없이 파일을 읽는 화면(피드백 목록)이 반쯤 쓰인 파일을 보지 않도록, 설정 파일과 같은 방식으로 한 번에 교체합니다.
+    _write_json_atomic(all_feedback, FEEDBACK_FILE)
+    return index_was_current
+
 def save_feedback(feedback_text):
     """
-    사용자가 입력한 피드백을 JSON 파일에 객체 형태로 저장합니다.
+    사용자가 입력한 피드백을 JSON 파일에 객체 형태로 저장하고, 검색 색인에도 추가합니다.
     """
     if feedback_text.strip():
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         new_feedback = {
+            'id': uuid.uuid4().hex,  # 같은 초에 저장된 피드백도 구분할 수 있도록 고유 id를 붙입니다.
             'timestamp': timestamp,
             'text': feedback_text.strip(),
             'status': 'open'  # 'open' 또는 'resolved'
         }
         
-        all_feedback = load_feedback()
-        all_feedback.insert(0, new_feedback)  # 새 피드백을 맨 앞에 추가
-        
-        with open(FEEDBACK_FILE, 'w', encoding='utf-8') as f:
-            json.dump(all_feedback, f, indent=4, ensure_ascii=False)
+        # 색인은 잠금을 잡기 전에 가져옵니다. (잠금 순서: 색인 생성 → _feedback_lock)
+        index = get_feedback_index()
+        with _feedback_lock, _file_lock(FEEDBACK_FILE):
+            all_feedback = load_feedback()
+            all_feedback.insert(0, new_feedback)  # 새 피드백을 맨 앞에 추가
+
+            index_was_current = _write_feedback(all_feedback, index)
+            index.add(new_feedback, _feedback_mtime() if index_was_current else None)
         return True
     return False
 
@@ -386,15 +773,44 @@ def load_feedback():
             return [] # 파일이 비어있거나 형식이 잘못된 경우 빈 리스트 반환
     return []
 
-def update_feedback_status(timestamp, new_status):
+def update_feedback_status(feedback_id, new_status):
+    """
+    특정 id(예전 항목은 타임스탬프)를 가진 피드백의 상태를 변경합니다.
+    """
+    index = get_feedback_index()
+    with _feedback_lock, _file_lock(FEEDBACK_FILE):
+        all_feedback = load_feedback()
+        for feedback in all_feedback:
+            if feedback_id_of(feedback) == feedback_id:
+                feedback['status'] = new_status
+                break
+
+        index_was_current = _write_feedback(all_feedback, index)
+        index.set_status(feedback_id, new_status, _feedback_mtime() if index_was_current else None)
+
+# 검색 색인은 서버 프로세스 전체에서 하나만 만들어 모든 세션이 공유합니다.
+# 처음 한 번만 파일 전체로 만들고, 이후에는 save_feedback / update_feedback_status가 바뀐 항목만 반영합니다.
+@st.cache_resource
+def get_feedback_index():
+    """
+    피드백 검색 색인(FeedbackSearchIndex)을 반환합니다.
+    이 함수는 Streamlit의 캐시 잠금 안에서 실행되므로 _feedback_lock을 잡지 않습니다. (잡으면 저장 중인 세션과 서로 기다리게 됩니다.)
+    수정 시각을 파일보다 먼저 읽어 두므로, 그 사이에 파일이 바뀌면 다음 검색 때 잠금 안에서 색인이 다시 만들어집니다.
+    """
+    index = FeedbackSearchIndex()
+    mtime = _feedback_mtime()
+    index.rebuild(load_feedback(), mtime)
+    return index
+
+def search_feedback(query, status=None):
     """
-    특정 타임스탬프를 가진 피드백의 상태를 변경합니다.
+    피드백 본문을 검색하여 관련도 순으로 정렬된 피드백 id 목록을 반환합니다.
+    status('open' 또는 'resolved')를 주면 해당 상태의 피드백만 반환합니다.
     """
-    all_feedback = load_feedback()
-    for feedback in all_feedback:
-        if feedback['timestamp'] == timestamp:
-            feedback['status'] = new_status
-            break
-            
-    with open(FEEDBACK_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_feedback, f, indent=4, ensure_ascii=False)
+    index = get_feedback_index()
+    with _feedback_lock:
+        mtime = _feedback_mtime()
+        if index.source_mtime != mtime:
+            # 앱을 거치지 않고 파일이 바뀐 경우(직접 편집 등)에만 색인을 다시 만듭니다.
+            index.rebuild(load_feedback(), mtime)
+    return index.search(query, status)